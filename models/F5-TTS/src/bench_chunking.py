@@ -0,0 +1,123 @@
+from loguru import logger
+import argparse
+
+
+def main(config_base_path: str, config_path: str, schedules: list, runs: int):
+    # torch / f5_tts are imported here so that `--help` stays instant
+    from f5_tts.infer.utils_infer import load_vocoder, preprocess_ref_audio_text
+
+    from .utils.loader import prepare_model
+    from .utils.config_loader import load_configs
+    from .utils.inference import build_conditioning, synthesize_text
+
+    config = load_configs(config_base_path, config_path)
+    logger.info(f"Configs correctly loaded.")
+
+    vocoder = load_vocoder(vocoder_name=config.vocoder_name,
+                           is_local=config.vocoder_is_local,
+                           local_path=config.vocoder_local_path,
+                           hf_cache_dir=config.hf_cache_dir)
+    ema_model = prepare_model(model=config.model,
+                              model_cfg=config.model_cfg,
+                              ckpt_file=config.ckpt_file,
+                              vocoder_name=config.vocoder_name,
+                              vocab_file=config.vocab_file,
+                              cache_dir=config.hf_cache_dir)
+
+    voice = next(iter(config.voices.values()))
+    ref_audio, ref_text = preprocess_ref_audio_text(voice.ref_audio, voice.ref_text)
+    conditioning = build_conditioning(ref_audio, ref_text, ema_model, config.user_target_rms)
+    gen_text = config.gen_text or " ".join(entry["text"] for entry in config.gen_json)
+
+    def _synthesize(schedule):
+        return synthesize_text(
+            conditioning,
+            gen_text,
+            ema_model,
+            vocoder,
+            mel_spec_type=config.vocoder_name,
+            cross_fade_duration=config.user_cross_fade_duration,
+            nfe_step=config.user_nfe_step,
+            cfg_strength=config.user_cfg_strength,
+            sway_sampling_coef=config.user_sway_sampling_coef,
+            speed=config.user_speed,
+            fix_duration=config.user_fix_duration,
+            chunk_schedule=schedule,
+            first_chunk_max_chars=config.first_chunk_max_chars,
+            chunk_growth=config.chunk_growth,
+        )
+
+    # Warm-up run so that the first measured schedule does not pay for lazy initializations
+    _synthesize(schedules[0])
+
+    results = {}
+    for schedule in schedules:
+        first_audio, total, audio_seconds = [], [], []
+        for _ in range(runs):
+            wave, sample_rate, _, timings = _synthesize(schedule)
+            first_audio.append(timings['first_audio'])
+            total.append(timings['total'])
+            audio_seconds.append(len(wave) / sample_rate)
+        results[schedule] = {
+            'n_chunks': timings['n_chunks'],
+            'first_audio': sum(first_audio) / runs,
+            'total': sum(total) / runs,
+            'throughput': sum(audio_seconds) / sum(total),
+        }
+
+    print(f"{'schedule':<12} {'chunks':>6} {'first audio (s)':>16} {'total (s)':>10} {'audio s / s':>12}")
+    for schedule, r in results.items():
+        print(f"{schedule:<12} {r['n_chunks']:>6} {r['first_audio']:>16.2f} {r['total']:>10.2f} {r['throughput']:>12.2f}")
+    if "default" in results:
+        base = results["default"]
+        for schedule, r in results.items():
+            if schedule != "default":
+                logger.info(f"'{schedule}' vs 'default': time-to-first-audio x{base['first_audio'] / r['first_audio']:.2f} faster, "
+                            f"throughput {100 * (r['throughput'] / base['throughput'] - 1):+.1f}%")
+    return results
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="Compare time-to-first-audio and throughput of the F5-TTS chunk schedules",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--config-base-path',
+        type=str,
+        default="models/F5-TTS/config/base.yaml",
+        help="Path to the base configuration file."
+    )
+
+    parser.add_argument(
+        '--config-path',
+        type=str,
+        default="models/F5-TTS/config/basic.yaml",
+        help="Path to the specific configuration file (its text is used for the benchmark)."
+    )
+
+    parser.add_argument(
+        '--schedules',
+        nargs='+',
+        default=["default", "fast_start"],
+        help="Chunk schedules to compare."
+    )
+
+    parser.add_argument(
+        '--runs',
+        type=int,
+        default=3,
+        help="Number of measured runs per schedule."
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    logger.debug(f"Received arguments: {args}")
+
+    main(config_base_path=args.config_base_path, config_path=args.config_path, schedules=args.schedules, runs=args.runs)
@@ -0,0 +1,133 @@
+import time
+from loguru import logger
+import argparse
+
+
+def main(config_base_path: str, config_path: str, merge_max_chars: int, runs: int):
+    # torch / f5_tts are imported here so that `--help` stays instant
+    from f5_tts.infer.utils_infer import load_vocoder
+
+    from .utils.loader import prepare_model
+    from .utils.config_loader import load_configs
+    from .utils.inference import get_conditioning, prepare_voices, run_inference
+
+    config = load_configs(config_base_path, config_path)
+    logger.info(f"Configs correctly loaded.")
+    if not config.gen_json:
+        raise ValueError("The merge benchmark needs a JSON multi-voice script (gen_file)")
+    merge_max_chars = merge_max_chars or config.merge_max_chars
+    if not merge_max_chars:
+        raise ValueError("Set merge_max_chars in the config or with --merge-max-chars")
+
+    vocoder = load_vocoder(vocoder_name=config.vocoder_name,
+                           is_local=config.vocoder_is_local,
+                           local_path=config.vocoder_local_path,
+                           hf_cache_dir=config.hf_cache_dir)
+    ema_model = prepare_model(model=config.model,
+                              model_cfg=config.model_cfg,
+                              ckpt_file=config.ckpt_file,
+                              vocoder_name=config.vocoder_name,
+                              vocab_file=config.vocab_file,
+                              cache_dir=config.hf_cache_dir)
+    prepare_voices(config.voices)
+    # Conditionings are built before any timed run, so that neither mode pays for them
+    voice_cache = {}
+    for voice_info in config.voices.values():
+        get_conditioning(voice_cache, voice_info, ema_model, config.vocoder_name, config.user_target_rms)
+
+    def _render(gen_json, max_chars, output_file=None):
+        start = time.perf_counter()
+        run_inference(
+            voices_cfg=config.voices,
+            gen_text=config.gen_text,
+            gen_json=gen_json,
+            ema_model=ema_model,
+            vocoder=vocoder,
+            vocoder_name=config.vocoder_name,
+            target_rms=config.user_target_rms,
+            cross_fade_duration=config.user_cross_fade_duration,
+            nfe_step=config.user_nfe_step,
+            cfg_strength=config.user_cfg_strength,
+            sway_sampling_coef=config.user_sway_sampling_coef,
+            speed=config.user_speed,
+            fix_duration=config.user_fix_duration,
+            save_chunk=config.save_chunk and output_file is not None,
+            output_dir=config.output_dir if output_file else None,
+            output_file=output_file,
+            chunk_schedule=config.chunk_schedule,
+            first_chunk_max_chars=config.first_chunk_max_chars,
+            chunk_growth=config.chunk_growth,
+            voices_prepared=True,
+            voice_cache=voice_cache,
+            merge_max_chars=max_chars,
+        )
+        return time.perf_counter() - start
+
+    # Warm-up run so that the first measured mode does not pay for lazy initializations
+    _render([next(entry for entry in config.gen_json if entry.get("text", "").strip())], 0)
+
+    # Modes alternate in order from one run to the next, the median of each is kept
+    modes = [("separate", 0), ("merged", merge_max_chars)]
+    times = {name: [] for name, _ in modes}
+    for run in range(runs):
+        for name, max_chars in (modes if run % 2 == 0 else modes[::-1]):
+            times[name].append(_render(config.gen_json, max_chars, output_file=f"{name}_{config.output_file}"))
+    results = {name: sorted(samples)[len(samples) // 2] for name, samples in times.items()}
+
+    from .utils.script_merge import plan_merges
+
+    default_voice_key = list(config.voices.keys())[0]
+    entries = [(idx, entry.get("voice") if entry.get("voice") in config.voices else default_voice_key, entry.get("text"))
+               for idx, entry in enumerate(config.gen_json) if entry.get("text", "").strip()]
+    n_groups = len(plan_merges(entries, merge_max_chars))
+    logger.info(f"{len(entries)} entries -> {n_groups} inference calls ({len(entries) - n_groups} saved), "
+                f"median wall time over {runs} runs {results['separate']:.1f}s -> {results['merged']:.1f}s "
+                f"({results['separate'] - results['merged']:.1f}s saved)")
+    return results
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="Compare a multi-voice script rendered entry by entry and with adjacent same-voice entries merged",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--config-base-path',
+        type=str,
+        default="models/F5-TTS/config/base.yaml",
+        help="Path to the base configuration file."
+    )
+
+    parser.add_argument(
+        '--config-path',
+        type=str,
+        default="models/F5-TTS/config/basic.yaml",
+        help="Path to the specific configuration file (with a JSON gen_file)."
+    )
+
+    parser.add_argument(
+        '--merge-max-chars',
+        type=int,
+        default=0,
+        help="Merge budget in bytes, defaults to the configured merge_max_chars."
+    )
+
+    parser.add_argument(
+        '--runs',
+        type=int,
+        default=3,
+        help="Number of timed runs of each mode (the median is kept)."
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    logger.debug(f"Received arguments: {args}")
+
+    main(config_base_path=args.config_base_path, config_path=args.config_path, merge_max_chars=args.merge_max_chars,
+         runs=args.runs)
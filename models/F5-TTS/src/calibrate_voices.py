@@ -0,0 +1,62 @@
+from loguru import logger
+import argparse
+
+
+def main(config_base_path: str, config_path: str, reset: bool):
+    from .utils.config_loader import load_configs
+    from .utils.speaking_rate import (
+        calibrate_reference,
+        default_metadata_path,
+        load_voice_metadata,
+        save_voice_metadata,
+    )
+
+    config = load_configs(config_base_path, config_path)
+    logger.info(f"Configs correctly loaded.")
+
+    for voice_key, voice_info in config.voices.items():
+        metadata_path = voice_info.get("ref_meta") or default_metadata_path(voice_info.ref_audio)
+        metadata = {} if reset else load_voice_metadata(metadata_path)
+        metadata = calibrate_reference(voice_info.ref_audio, voice_info.ref_text, metadata)
+        save_voice_metadata(metadata_path, metadata)
+        logger.info(f"Voice '{voice_key}': reference rate {metadata['reference_rate']:.2f} units/s, "
+                    f"speaking rate {metadata['speaking_rate']:.2f} units/s ({metadata['n_observations']} observations) "
+                    f"-> {metadata_path}")
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="Measure the speaking rate of each configured voice from its reference clip and store it in the voice metadata",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--config-base-path',
+        type=str,
+        default="models/F5-TTS/config/base.yaml",
+        help="Path to the base configuration file."
+    )
+
+    parser.add_argument(
+        '--config-path',
+        type=str,
+        default="models/F5-TTS/config/basic.yaml",
+        help="Path to the specific configuration file."
+    )
+
+    parser.add_argument(
+        '--reset',
+        action='store_true',
+        help="Discard the rates learned from previous generations."
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    logger.debug(f"Received arguments: {args}")
+
+    main(config_base_path=args.config_base_path, config_path=args.config_path, reset=args.reset)
@@ -0,0 +1,73 @@
+import os
+from loguru import logger
+import argparse
+
+
+def main(archive_dir: str, output_dir: str, ids: list, list_only: bool):
+    import soundfile as sf
+
+    from .utils.chunk_archive import ChunkArchive, chunk_file_name
+
+    with ChunkArchive(archive_dir) as archive:
+        if list_only:
+            for entry in archive.entries:
+                print(f"{entry['id']:>6}  segment {entry.get('segment', '-'):>5}  {entry.get('voice', ''):<12} "
+                      f"{entry['frames'] / entry['sample_rate']:>7.2f}s  {entry.get('text', '')[:60]}")
+            return
+
+        ids = ids if ids else range(len(archive))
+        # Names are padded for the largest segment id, which exceeds the chunk count when script entries were skipped
+        n_segments = max((entry.get('segment', entry['id']) for entry in archive.entries), default=-1) + 1
+        os.makedirs(output_dir, exist_ok=True)
+        for chunk_id in ids:
+            entry = archive.entries[chunk_id]
+            wave, sample_rate = archive.read(chunk_id)
+            name = chunk_file_name(entry.get('segment', chunk_id), entry.get('voice', "chunk"), n_segments)
+            sf.write(os.path.join(output_dir, name), wave, sample_rate)
+        logger.info(f"Extracted {len(ids)} chunks from {archive_dir} to {output_dir}")
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="List or extract chunks from a chunk archive written by run_inference",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--archive-dir',
+        type=str,
+        required=True,
+        help="Chunk archive directory (<output>_chunk_archive)."
+    )
+
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default="data/gen/extracted_chunks",
+        help="Directory where the extracted chunks are written as wav files."
+    )
+
+    parser.add_argument(
+        '--ids',
+        type=int,
+        nargs='*',
+        default=None,
+        help="Chunk ids to extract, all of them if not set."
+    )
+
+    parser.add_argument(
+        '--list',
+        action='store_true',
+        help="Only list the archived chunks."
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    logger.debug(f"Received arguments: {args}")
+
+    main(archive_dir=args.archive_dir, output_dir=args.output_dir, ids=args.ids, list_only=args.list)
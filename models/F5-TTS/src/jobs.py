@@ -0,0 +1,216 @@
+import json
+import time
+from loguru import logger
+import argparse
+
+
+def submit(queue, config_base_path: str, params_path: str, priority: int, max_attempts: int):
+    from omegaconf import OmegaConf
+
+    from .utils.config_loader import validate_overrides
+
+    params = OmegaConf.to_container(OmegaConf.load(params_path))
+    validate_overrides(OmegaConf.load(config_base_path), params)
+    job_id = queue.submit(params, priority=priority, max_attempts=max_attempts)
+    logger.info(f"Job {job_id} queued with priority {priority}")
+    return job_id
+
+
+def run_job(job, worker_config, registry, queue, voice_caches):
+    from .utils.config_loader import merge_overrides, resolve_config
+    from .utils.inference import VoiceCache, run_inference
+    from .utils.model_registry import model_key
+
+    config = resolve_config(merge_overrides(worker_config, job['params']))
+    # A job's own transcript must reach the synthesis, never one inherited from the worker config
+    for voice_key, voice_info in (job['params'].get('voices') or {}).items():
+        if voice_info.get('ref_text') and not voice_info.get('ref_file') \
+                and config.voices[voice_key].ref_text != voice_info['ref_text']:
+            raise ValueError(f"The ref_text of voice '{voice_key}' was replaced while resolving the job config")
+    # Jobs may select any model / checkpoint / vocoder, the registry loads them on first use
+    ema_model, vocoder = registry.get_for_config(config)
+    # Conditionings are computed by a model: they are dropped with it when the registry evicts it
+    loaded = {key for key, _ in registry.loaded()}
+    for key in [key for key in voice_caches if key not in loaded]:
+        del voice_caches[key]
+    voice_cache = voice_caches.setdefault(
+        model_key(config.model, config.ckpt_file, config.vocoder_name, config.vocab_file),
+        VoiceCache(config.voice_cache_max_voices))
+    start = time.perf_counter()
+    final_wave, final_sample_rate = run_inference(
+        voices_cfg=config.voices,
+        gen_text=config.gen_text,
+        gen_json=config.gen_json,
+        ema_model=ema_model,
+        vocoder=vocoder,
+        vocoder_name=config.vocoder_name,
+        target_rms=config.user_target_rms,
+        cross_fade_duration=config.user_cross_fade_duration,
+        nfe_step=config.user_nfe_step,
+        cfg_strength=config.user_cfg_strength,
+        sway_sampling_coef=config.user_sway_sampling_coef,
+        speed=config.user_speed,
+        fix_duration=config.user_fix_duration,
+        save_chunk=config.save_chunk,
+        chunk_archive=config.chunk_archive,
+        save_mel=config.save_mel,
+        output_dir=config.output_dir,
+        output_file=config.output_file,
+        remove_silence=config.remove_silence,
+        chunk_schedule=config.chunk_schedule,
+        first_chunk_max_chars=config.first_chunk_max_chars,
+        chunk_growth=config.chunk_growth,
+        merge_max_chars=config.merge_max_chars,
+        use_speaking_rate=config.use_speaking_rate,
+        learn_speaking_rate=config.learn_speaking_rate,
+        memory_budget_mb=config.memory_budget_mb,
+        cancel_check=lambda: queue.cancel_requested(job['id']),
+        voice_cache=voice_cache,
+    )
+    return {
+        'output_dir': config.output_dir,
+        'output_file': config.output_file,
+        'audio_duration': len(final_wave) / final_sample_rate,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def work(queue, config_base_path: str, config_path: str, poll_interval: float, stale_after: float, once: bool):
+    # torch / f5_tts are imported here so that `--help` stays instant
+    from omegaconf import OmegaConf
+    from shared_utils.resource_plan import plan_from_config
+
+    from .utils.config_loader import load_configs
+
+    config = load_configs(config_base_path, config_path)
+    plan = plan_from_config("inference", config.resources).apply().log()
+
+    from .utils.inference import InferenceCancelled
+    from .utils.job_queue import JobHeartbeat
+    from .utils.model_registry import ModelRegistry
+
+    # Unresolved config, job parameters are merged into it before resolving
+    worker_config = OmegaConf.merge(OmegaConf.load(config_base_path), OmegaConf.load(config_path))
+
+    # Without an explicit ceiling, the weights kept loaded are bounded by the memory available at startup
+    max_mb = config.model_registry_max_mb
+    registry = ModelRegistry(max_bytes=max_mb * 1024 ** 2 if max_mb else plan.memory, hf_cache_dir=config.hf_cache_dir)
+    # Warm up with the worker's default model and vocoder
+    registry.get_for_config(config)
+    # Voice conditionings reused by the jobs sharing a voice, one bounded cache per loaded model
+    voice_caches = {}
+    logger.info(f"Worker ready with model '{config.model}' and vocoder '{config.vocoder_name}'")
+
+    while True:
+        requeued = queue.requeue_stale(stale_after)
+        if requeued:
+            logger.warning(f"Re-queued {requeued} jobs of unresponsive workers")
+
+        job = queue.claim()
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logger.info(f"Running job {job['id']} (priority {job['priority']}, attempt {job['attempts']}/{job['max_attempts']})")
+        try:
+            # Heartbeats run for the whole job, model loading and output writing included
+            with JobHeartbeat(queue.db_path, job['id'], interval=max(1.0, stale_after / 10)):
+                result = run_job(job, worker_config, registry, queue, voice_caches)
+        except InferenceCancelled:
+            queue.mark_cancelled(job['id'])
+            logger.info(f"Job {job['id']} cancelled")
+        except KeyboardInterrupt:
+            queue.fail(job['id'], "Worker interrupted")
+            raise
+        except Exception as e:
+            status = queue.fail(job['id'], f"{type(e).__name__}: {e}")
+            logger.exception(f"Job {job['id']} failed ({status})")
+        else:
+            queue.complete(job['id'], result)
+            logger.info(f"Job {job['id']} done in {result['elapsed']:.1f}s "
+                        f"({registry.total_bytes / 1024 ** 2:.0f} MB of weights loaded)")
+
+
+def main(args):
+    from .utils.job_queue import JobQueue
+
+    queue = JobQueue(args.db_path)
+    try:
+        if args.command == "submit":
+            print(submit(queue, args.config_base_path, args.params_path, args.priority, args.max_attempts))
+        elif args.command == "status":
+            job = queue.get(args.job_id)
+            print(json.dumps(job, indent=2) if job else f"No job {args.job_id}")
+        elif args.command == "list":
+            print(json.dumps(queue.counts()))
+            for job in queue.list(status=args.status, limit=args.limit):
+                print(f"{job['id']:>6}  {job['status']:<9}  priority {job['priority']:>3}  "
+                      f"attempts {job['attempts']}/{job['max_attempts']}  {job['error'] or ''}")
+        elif args.command == "cancel":
+            print(queue.cancel(args.job_id))
+        elif args.command == "retry":
+            print(queue.retry(args.job_id, priority=args.priority))
+        elif args.command == "work":
+            work(queue, args.config_base_path, args.config_path, args.poll_interval, args.stale_after, args.once)
+    finally:
+        queue.close()
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="F5-TTS job queue: submit, inspect, cancel and run synthesis jobs",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--db-path',
+        type=str,
+        default="data/jobs/jobs.sqlite",
+        help="Path to the SQLite job database."
+    )
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    submit_parser = subparsers.add_parser("submit", help="Queue a job.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    submit_parser.add_argument('params_path', type=str, help="YAML/JSON file of config overrides for the job.")
+    submit_parser.add_argument('--priority', type=int, default=0, help="Higher priorities run first (e.g. 10 for interactive previews).")
+    submit_parser.add_argument('--max-attempts', type=int, default=3, help="Number of attempts before the job is marked failed.")
+    submit_parser.add_argument('--config-base-path', type=str, default="models/F5-TTS/config/base.yaml",
+                               help="Base configuration defining the allowed keys.")
+
+    status_parser = subparsers.add_parser("status", help="Show a job.")
+    status_parser.add_argument('job_id', type=int)
+
+    list_parser = subparsers.add_parser("list", help="List jobs.", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    list_parser.add_argument('--status', type=str, default=None, help="Only list jobs with this status.")
+    list_parser.add_argument('--limit', type=int, default=50, help="Maximum number of jobs listed.")
+
+    cancel_parser = subparsers.add_parser("cancel", help="Cancel a queued or running job.")
+    cancel_parser.add_argument('job_id', type=int)
+
+    retry_parser = subparsers.add_parser("retry", help="Queue a failed or cancelled job again.")
+    retry_parser.add_argument('job_id', type=int)
+    retry_parser.add_argument('--priority', type=int, default=None, help="New priority, keeps the previous one if not set.")
+
+    work_parser = subparsers.add_parser("work", help="Run a worker pulling jobs from the queue.",
+                                        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    work_parser.add_argument('--config-base-path', type=str, default="models/F5-TTS/config/base.yaml",
+                             help="Path to the base configuration file.")
+    work_parser.add_argument('--config-path', type=str, default="models/F5-TTS/config/basic.yaml",
+                             help="Path to the worker configuration file (default model and vocoder, job defaults).")
+    work_parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds between polls of an empty queue.")
+    work_parser.add_argument('--stale-after', type=float, default=600, help="Seconds without heartbeat after which a running job is re-queued.")
+    work_parser.add_argument('--once', action='store_true', help="Exit once the queue is empty.")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    logger.debug(f"Received arguments: {args}")
+
+    main(args)
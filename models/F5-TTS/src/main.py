@@ -1,19 +1,23 @@
 from loguru import logger
 import argparse
 
-from f5_tts.infer.utils_infer import load_vocoder
-
-from .utils.loader import prepare_model
-from .utils.config_loader import load_configs
-from .utils.inference import run_inference
-
 
 def main(config_base_path: str, config_path: str):
+    from .utils.config_loader import load_configs, inference_resource_plan
 
     config = load_configs(config_base_path, config_path)
     logger.info(f"Configs correctly loaded.")
     logger.debug(f"Received arguments: {config}")
 
+    # Thread settings are applied before torch starts its thread pools
+    plan = inference_resource_plan(config).apply().log()
+
+    # torch / f5_tts are imported here so that `--help` stays instant
+    from f5_tts.infer.utils_infer import load_vocoder
+
+    from .utils.loader import prepare_model
+    from .utils.inference import run_inference
+
     vocoder = load_vocoder(vocoder_name=config.vocoder_name,
                            is_local=config.vocoder_is_local,
                            local_path=config.vocoder_local_path,
@@ -28,25 +32,46 @@ def main(config_base_path: str, config_path: str):
                               cache_dir=config.hf_cache_dir)
     logger.info(f"Model '{config.model}' loaded ")
 
-    final_wave, final_sample_rate = run_inference(
-        voices_cfg=config.voices,
-        gen_text=config.gen_text,
-        gen_json=config.gen_json,
-        ema_model=ema_model,
-        vocoder=vocoder,
-        vocoder_name=config.vocoder_name,
-        target_rms=config.user_target_rms,
-        cross_fade_duration=config.user_cross_fade_duration,
-        nfe_step=config.user_nfe_step,
-        cfg_strength=config.user_cfg_strength,
-        sway_sampling_coef=config.user_sway_sampling_coef,
-        speed=config.user_speed,
-        fix_duration=config.user_fix_duration,
-        save_chunk=config.save_chunk,
-        output_dir=config.output_dir,
-        output_file=config.output_file,
-        remove_silence=config.remove_silence,
-    )
+    chunk_pool = None
+    if config.chunk_workers and plan.workers > 1:
+        from .utils.parallel_chunks import ChunkWorkerPool
+        chunk_pool = ChunkWorkerPool(ema_model, vocoder, config.vocoder_name,
+                                     n_workers=plan.workers, threads_per_worker=plan.threads_per_worker)
+
+    # The pool workers hold the shared weights: always stop them, even if the inference fails
+    try:
+        final_wave, final_sample_rate = run_inference(
+            voices_cfg=config.voices,
+            gen_text=config.gen_text,
+            gen_json=config.gen_json,
+            ema_model=ema_model,
+            vocoder=vocoder,
+            vocoder_name=config.vocoder_name,
+            target_rms=config.user_target_rms,
+            cross_fade_duration=config.user_cross_fade_duration,
+            nfe_step=config.user_nfe_step,
+            cfg_strength=config.user_cfg_strength,
+            sway_sampling_coef=config.user_sway_sampling_coef,
+            speed=config.user_speed,
+            fix_duration=config.user_fix_duration,
+            save_chunk=config.save_chunk,
+            chunk_archive=config.chunk_archive,
+            save_mel=config.save_mel,
+            output_dir=config.output_dir,
+            output_file=config.output_file,
+            remove_silence=config.remove_silence,
+            chunk_schedule=config.chunk_schedule,
+            first_chunk_max_chars=config.first_chunk_max_chars,
+            chunk_growth=config.chunk_growth,
+            merge_max_chars=config.merge_max_chars,
+            chunk_pool=chunk_pool,
+            use_speaking_rate=config.use_speaking_rate,
+            learn_speaking_rate=config.learn_speaking_rate,
+            memory_budget_mb=config.memory_budget_mb,
+        )
+    finally:
+        if chunk_pool is not None:
+            chunk_pool.close()
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -0,0 +1,93 @@
+from pathlib import Path
+from loguru import logger
+import argparse
+
+
+def rerender_file_name(output_file: str, vocoder_name: str):
+    """Default name of a re-render, next to (and never over) the original render."""
+    output_file = Path(output_file)
+    return f"{output_file.stem}_rerender_{vocoder_name}{output_file.suffix or '.wav'}"
+
+
+def main(config_base_path: str, config_path: str, mel_dir: str, output_file: str, cross_fade_duration: float):
+    # torch / f5_tts are imported here so that `--help` stays instant
+    from f5_tts.infer.utils_infer import load_vocoder
+
+    from .utils.config_loader import load_configs
+    from .utils.inference import mel_store_dir, render_mel_store
+
+    config = load_configs(config_base_path, config_path)
+    logger.info(f"Configs correctly loaded.")
+
+    mel_dir = mel_dir or mel_store_dir(config.output_dir, config.output_file)
+
+    vocoder = load_vocoder(vocoder_name=config.vocoder_name,
+                           is_local=config.vocoder_is_local,
+                           local_path=config.vocoder_local_path,
+                           hf_cache_dir=config.hf_cache_dir)
+    logger.info(f"Vocoder '{config.vocoder_name}' loaded ")
+
+    final_wave, final_sample_rate = render_mel_store(
+        mel_dir,
+        vocoder=vocoder,
+        vocoder_name=config.vocoder_name,
+        cross_fade_duration=cross_fade_duration,
+        output_dir=config.output_dir,
+        output_file=output_file or rerender_file_name(config.output_file, config.vocoder_name),
+        remove_silence=config.remove_silence,
+    )
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="Re-render F5-TTS audio from stored mel spectrograms (vocoder, silence removal and assembly only)",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--config-base-path',
+        type=str,
+        default="models/F5-TTS/config/base.yaml",
+        help="Path to the base configuration file."
+    )
+
+    parser.add_argument(
+        '--config-path',
+        type=str,
+        default="models/F5-TTS/config/basic.yaml",
+        help="Path to the specific configuration file (vocoder, output and silence removal settings)."
+    )
+
+    parser.add_argument(
+        '--mel-dir',
+        type=str,
+        default=None,
+        help="Mel store directory, defaults to the one saved next to the configured output file."
+    )
+
+    parser.add_argument(
+        '--output-file',
+        type=str,
+        default=None,
+        help="Name of the re-rendered file in the output directory, defaults to <output stem>_rerender_<vocoder>.wav "
+             "so that the original render is kept for comparison."
+    )
+
+    parser.add_argument(
+        '--cross-fade-duration',
+        type=float,
+        default=None,
+        help="Chunk cross-fade in seconds, defaults to the one used at generation."
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    logger.debug(f"Received arguments: {args}")
+
+    main(config_base_path=args.config_base_path, config_path=args.config_path, mel_dir=args.mel_dir,
+         output_file=args.output_file, cross_fade_duration=args.cross_fade_duration)
@@ -0,0 +1,230 @@
+import itertools
+import json
+import os
+import time
+from pathlib import Path
+from loguru import logger
+import argparse
+
+
+# Config keys that can be swept, and the `run_inference` argument each one feeds
+SWEEP_PARAMS = {
+    'user_nfe_step': 'nfe_step',
+    'user_cfg_strength': 'cfg_strength',
+    'user_sway_sampling_coef': 'sway_sampling_coef',
+    'user_speed': 'speed',
+    'user_target_rms': 'target_rms',
+    'user_cross_fade_duration': 'cross_fade_duration',
+    'user_fix_duration': 'fix_duration',
+}
+
+_SHORT_NAMES = {
+    'user_nfe_step': 'nfe',
+    'user_cfg_strength': 'cfg',
+    'user_sway_sampling_coef': 'sway',
+    'user_speed': 'speed',
+    'user_target_rms': 'rms',
+    'user_cross_fade_duration': 'xfade',
+    'user_fix_duration': 'dur',
+}
+
+# Model, vocoder, config and voice conditionings of the current process, loaded once by `_load_worker`
+_worker = {}
+
+
+def load_grid(grid_path):
+    """
+    Load a parameter grid from a YAML file mapping config keys to lists of values, e.g.
+
+        user_nfe_step: [16, 32]
+        user_cfg_strength: [1.5, 2.0]
+
+    A scalar value is treated as a one-element list.
+    """
+    from omegaconf import OmegaConf
+
+    grid = OmegaConf.to_container(OmegaConf.load(grid_path))
+    unknown = [key for key in grid if key not in SWEEP_PARAMS]
+    if unknown:
+        raise ValueError(f"Unsupported sweep parameters {unknown}, expected some of {list(SWEEP_PARAMS)}")
+    return {key: values if isinstance(values, list) else [values] for key, values in grid.items()}
+
+
+def expand_grid(grid):
+    """Return every combination of the grid as a list of {config key: value} dicts."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def combination_name(idx, combination):
+    parts = [f"{_SHORT_NAMES[key]}{value}" for key, value in combination.items()]
+    return "_".join([f"{idx:04d}"] + parts)
+
+
+def _load_worker(config_dict, n_threads=None):
+    import torch
+    from omegaconf import OmegaConf
+    from f5_tts.infer.utils_infer import load_vocoder
+
+    from .utils.loader import prepare_model
+
+    if n_threads:
+        torch.set_num_threads(n_threads)
+
+    config = OmegaConf.create(config_dict)
+    _worker['config'] = config
+    _worker['voice_cache'] = {}
+    _worker['vocoder'] = load_vocoder(vocoder_name=config.vocoder_name,
+                                      is_local=config.vocoder_is_local,
+                                      local_path=config.vocoder_local_path,
+                                      hf_cache_dir=config.hf_cache_dir)
+    _worker['ema_model'] = prepare_model(model=config.model,
+                                         model_cfg=config.model_cfg,
+                                         ckpt_file=config.ckpt_file,
+                                         vocoder_name=config.vocoder_name,
+                                         vocab_file=config.vocab_file,
+                                         cache_dir=config.hf_cache_dir)
+    logger.info(f"Worker {os.getpid()} loaded model '{config.model}' and vocoder '{config.vocoder_name}'")
+
+
+def _run_combination(idx, combination, sweep_dir):
+    from .utils.inference import run_inference
+
+    config = _worker['config']
+    params = {arg: config[key] for key, arg in SWEEP_PARAMS.items()}
+    params.update({SWEEP_PARAMS[key]: value for key, value in combination.items()})
+    output_file = f"{combination_name(idx, combination)}.wav"
+
+    start = time.perf_counter()
+    final_wave, final_sample_rate = run_inference(
+        voices_cfg=config.voices,
+        gen_text=config.gen_text,
+        gen_json=config.gen_json,
+        ema_model=_worker['ema_model'],
+        vocoder=_worker['vocoder'],
+        vocoder_name=config.vocoder_name,
+        output_dir=str(sweep_dir),
+        output_file=output_file,
+        remove_silence=config.remove_silence,
+        chunk_schedule=config.chunk_schedule,
+        first_chunk_max_chars=config.first_chunk_max_chars,
+        chunk_growth=config.chunk_growth,
+        merge_max_chars=config.merge_max_chars,
+        use_speaking_rate=config.use_speaking_rate,
+        voices_prepared=True,
+        voice_cache=_worker['voice_cache'],
+        **params,
+    )
+    latency = time.perf_counter() - start
+    audio_duration = len(final_wave) / final_sample_rate
+
+    return {
+        'index': idx,
+        'params': combination,
+        'output_file': output_file,
+        'latency': latency,
+        'audio_duration': audio_duration,
+        'rtf': latency / audio_duration if audio_duration else None,
+    }
+
+
+def main(config_base_path: str, config_path: str, grid_path: str, workers: int):
+    # torch / f5_tts are imported here so that `--help` stays instant
+    from omegaconf import OmegaConf
+    from shared_utils.resource_plan import plan_from_config
+
+    from .utils.config_loader import load_configs
+
+    config = load_configs(config_base_path, config_path)
+    logger.info(f"Configs correctly loaded.")
+
+    # Each worker loads its own model: the plan bounds their number by CPU and memory
+    plan = plan_from_config("sweep", config.resources, workers=workers).apply().log()
+    workers = plan.workers
+
+    from .utils.inference import prepare_voices
+
+    combinations = expand_grid(load_grid(grid_path))
+    logger.info(f"Sweeping {len(combinations)} parameter combinations with {workers} worker(s)")
+
+    # Reference preprocessing is shared by every combination: run it once, workers get the processed paths
+    prepare_voices(config.voices)
+    config_dict = OmegaConf.to_container(config)
+
+    sweep_dir = Path(config.output_dir) / f"{Path(config.output_file).stem}_sweep"
+    os.makedirs(sweep_dir, exist_ok=True)
+
+    results = []
+    if workers <= 1:
+        _load_worker(config_dict)
+        for idx, combination in enumerate(combinations):
+            results.append(_run_combination(idx, combination, sweep_dir))
+            logger.info(f"[{idx + 1}/{len(combinations)}] {combination}: {results[-1]['latency']:.2f}s")
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_load_worker,
+                                 initargs=(config_dict, plan.threads_per_worker)) as executor:
+            futures = {executor.submit(_run_combination, idx, combination, sweep_dir): combination
+                       for idx, combination in enumerate(combinations)}
+            for future in as_completed(futures):
+                results.append(future.result())
+                logger.info(f"[{len(results)}/{len(combinations)}] {futures[future]}: {results[-1]['latency']:.2f}s")
+        results.sort(key=lambda r: r['index'])
+
+    index_path = sweep_dir / "index.json"
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    logger.info(f"Sweep results index written to {index_path}")
+    return results
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="F5-TTS parameter sweep: run a grid of inference settings with a single loaded model",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--config-base-path',
+        type=str,
+        default="models/F5-TTS/config/base.yaml",
+        help="Path to the base configuration file."
+    )
+
+    parser.add_argument(
+        '--config-path',
+        type=str,
+        default="models/F5-TTS/config/basic.yaml",
+        help="Path to the specific configuration file."
+    )
+
+    parser.add_argument(
+        '--grid-path',
+        type=str,
+        default="models/F5-TTS/config/sweep.yaml",
+        help="Path to the YAML parameter grid."
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help="Number of worker processes, each loading its own copy of the model (1 runs in-process, "
+             "0 sizes it from the CPUs and memory available)."
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    logger.debug(f"Received arguments: {args}")
+
+    main(config_base_path=args.config_base_path, config_path=args.config_path,
+         grid_path=args.grid_path, workers=args.workers)
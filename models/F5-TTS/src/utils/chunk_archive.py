@@ -0,0 +1,104 @@
+import json
+import os
+from pathlib import Path
+import numpy as np
+
+
+class ChunkArchive:
+    """
+    Single-file archive of generated chunks: the audio of every chunk is appended as 16-bit PCM
+    to `audio.pcm`, and one JSON line per chunk is appended to `index.jsonl` with its offset and
+    length (in samples), sample rate and free metadata (voice, text, parameters, timings, ...).
+
+    Both files are only ever appended to, so an interrupted run keeps every chunk indexed before
+    the interruption. A chunk is read back by id through a memory map of the audio file.
+
+    Parameters:
+        archive_dir (str or Path): Directory holding `audio.pcm` and `index.jsonl`.
+        mode (str): 'r' to read, 'w' to start a new archive, 'a' to append to an existing one.
+    """
+
+    AUDIO_FILE = "audio.pcm"
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(self, archive_dir, mode="r"):
+        if mode not in ("r", "w", "a"):
+            raise ValueError(f"Invalid mode '{mode}', expected 'r', 'w' or 'a'")
+        self.archive_dir = Path(archive_dir)
+        self.mode = mode
+        self.entries = []
+        self._audio_file = None
+        self._index_file = None
+        self._data = None
+
+        if mode == "w":
+            os.makedirs(self.archive_dir, exist_ok=True)
+            for name in (self.AUDIO_FILE, self.INDEX_FILE):
+                open(self.archive_dir / name, "wb").close()
+        else:
+            self._load_index()
+
+        self.n_samples = os.path.getsize(self.archive_dir / self.AUDIO_FILE) // 2
+        if mode in ("w", "a"):
+            self._audio_file = open(self.archive_dir / self.AUDIO_FILE, "ab")
+            self._index_file = open(self.archive_dir / self.INDEX_FILE, "a", encoding="utf-8")
+
+    def _load_index(self):
+        index_path = self.archive_dir / self.INDEX_FILE
+        valid_bytes = 0
+        with open(index_path, "rb") as f:
+            for line in f:
+                try:
+                    self.entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Line cut by an interruption: the chunks before it are complete
+                    break
+                valid_bytes += len(line)
+        if self.mode == "a" and valid_bytes < os.path.getsize(index_path):
+            os.truncate(index_path, valid_bytes)
+
+    def append(self, wave, sample_rate: int, **meta):
+        """Append a float wave with its metadata. Returns the chunk id."""
+        pcm = (np.clip(np.asarray(wave, dtype=np.float32), -1.0, 1.0) * 32767).astype("<i2")
+        entry = {'id': len(self.entries), 'offset': self.n_samples, 'frames': int(pcm.size), 'sample_rate': sample_rate}
+        entry.update(meta)
+
+        self._audio_file.write(pcm.tobytes())
+        self._audio_file.flush()
+        self._index_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._index_file.flush()
+
+        self.entries.append(entry)
+        self.n_samples += pcm.size
+        self._data = None
+        return entry['id']
+
+    def read(self, chunk_id: int):
+        """Return (float32 wave, sample rate) of `chunk_id`."""
+        entry = self.entries[chunk_id]
+        if self._data is None:
+            self._data = np.memmap(self.archive_dir / self.AUDIO_FILE, dtype="<i2", mode="r", shape=(self.n_samples,))
+        pcm = self._data[entry['offset']:entry['offset'] + entry['frames']]
+        return pcm.astype(np.float32) / 32767, entry['sample_rate']
+
+    def __len__(self):
+        return len(self.entries)
+
+    def close(self):
+        for f in (self._audio_file, self._index_file):
+            if f is not None:
+                f.close()
+        self._audio_file = self._index_file = None
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def chunk_file_name(idx: int, voice_key: str, n_chunks: int):
+    """File name of chunk `idx`, zero-padded to at least 3 digits and enough for `n_chunks` chunks."""
+    width = max(3, len(str(max(n_chunks - 1, 0))))
+    return f"{idx:0{width}d}_{voice_key}.wav"
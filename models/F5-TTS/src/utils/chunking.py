@@ -0,0 +1,115 @@
+import re
+
+
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])")
+CLAUSE_PATTERN = re.compile(r"(?<=[;:,.!?])\s+|(?<=[；：，。！？])")
+
+CHUNK_SCHEDULES = ("default", "fast_start")
+
+
+def _nbytes(text):
+    return len(text.encode("utf-8"))
+
+
+def _join(left, right):
+    # Same spacing rule as f5_tts chunk_text: no space after a multi-byte (e.g. CJK) character
+    if not left:
+        return right
+    return left + (" " if _nbytes(left[-1]) == 1 else "") + right
+
+
+def _pack(pieces, max_chars):
+    """Greedily pack pieces into chunks of at most `max_chars` bytes (a single longer piece is kept whole)."""
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if current and _nbytes(_join(current, piece)) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = _join(current, piece)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_sentences(text):
+    return [s.strip() for s in SENTENCE_PATTERN.split(text) if s.strip()]
+
+
+def split_clauses(text, max_chars):
+    """Split an over-long sentence at clause punctuation, then at word boundaries if still needed."""
+    chunks = []
+    for chunk in _pack([c.strip() for c in CLAUSE_PATTERN.split(text) if c.strip()], max_chars):
+        if _nbytes(chunk) > max_chars and " " in chunk:
+            chunks.extend(_pack(chunk.split(" "), max_chars))
+        else:
+            chunks.append(chunk)
+    return chunks
+
+
+def reference_max_chars(ref_text, ref_audio_duration):
+    """
+    Chunk size used by f5_tts `infer_process`: the number of bytes of text the reference voice
+    would speak in the time left by the reference within the 25 s the model is trained on.
+    """
+    return int(_nbytes(ref_text) / ref_audio_duration * (25 - ref_audio_duration))
+
+
+def default_schedule(gen_text, max_chars):
+    """Chunks of roughly equal size, exactly as f5_tts `infer_process` splits them."""
+    from f5_tts.infer.utils_infer import chunk_text
+    return chunk_text(gen_text, max_chars=max_chars)
+
+
+def fast_start_schedule(gen_text, max_chars, first_chunk_max_chars=80, growth=2.0):
+    """
+    Chunks optimized for time-to-first-audio.
+
+    The first chunk is kept short (one short sentence, at most `first_chunk_max_chars` bytes)
+    so that it is generated quickly, then each chunk budget grows by `growth` up to `max_chars`
+    for throughput. Chunks always end on a sentence boundary, unless a single sentence is larger
+    than the budget, in which case it is split at clause (then word) boundaries.
+
+    Parameters:
+        gen_text (str): Text to generate.
+        max_chars (int): Maximum chunk size in bytes (see `reference_max_chars`).
+        first_chunk_max_chars (int): Size budget in bytes of the first chunk.
+        growth (float): Budget multiplier from one chunk to the next.
+
+    Returns:
+        list[str]: The text chunks, in order.
+    """
+    budget = max(1, min(first_chunk_max_chars, max_chars))
+    units = split_sentences(gen_text)
+    chunks = []
+    current = ""
+    idx = 0
+    while idx < len(units):
+        unit = units[idx]
+        if not current and _nbytes(unit) > budget:
+            pieces = split_clauses(unit, budget)
+            units[idx:idx + 1] = pieces
+            unit = pieces[0]
+
+        if current and _nbytes(_join(current, unit)) > budget:
+            chunks.append(current)
+            current = ""
+            budget = max(budget, min(max_chars, int(budget * growth)))
+            continue
+
+        current = _join(current, unit)
+        idx += 1
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def schedule_chunks(gen_text, max_chars, schedule="default", first_chunk_max_chars=80, growth=2.0):
+    """Split `gen_text` into generation chunks with the given schedule (see CHUNK_SCHEDULES)."""
+    if schedule == "default":
+        return default_schedule(gen_text, max_chars)
+    elif schedule == "fast_start":
+        return fast_start_schedule(gen_text, max_chars, first_chunk_max_chars=first_chunk_max_chars, growth=growth)
+    raise ValueError(f"Invalid chunk schedule '{schedule}', expected one of {CHUNK_SCHEDULES}")
@@ -1,4 +1,5 @@
 import codecs
+import copy
 from importlib.resources import files
 from omegaconf import OmegaConf
 from pathlib import Path
@@ -14,7 +15,11 @@ def load_configs(config_base_path, config_path):
     logger.info(f"Config file loaded from '{config_path}'")
 
     conf = OmegaConf.merge(config_base, config)
+    return resolve_config(conf)
 
+
+def resolve_config(conf):
+    """Fill the derived fields of a merged config: model_cfg, gen_text/gen_json from gen_file, voices ref_text from ref_file."""
     if conf.model == "F5-TTS":
         conf.model_cfg = str(files("f5_tts").joinpath("configs/F5TTS_Base_train.yaml"))
     elif conf.model == "E2-TTS":
@@ -45,3 +50,52 @@ def load_configs(config_base_path, config_path):
             conf.voices[voice_key]["ref_text"] = voice_text
 
     return conf
+
+
+def inference_resource_plan(config):
+    """
+    Resource plan of an inference process: sized for its chunk worker pool when `chunk_workers` is
+    set ("auto" lets the plan choose the number of workers), else all threads go to the process itself.
+    """
+    from shared_utils.resource_plan import plan_from_config
+
+    if config.chunk_workers:
+        workers = None if config.chunk_workers == "auto" else config.chunk_workers
+        return plan_from_config("chunk_workers", config.resources, workers=workers)
+    return plan_from_config("inference", config.resources)
+
+
+def merge_overrides(config, overrides: dict):
+    """
+    Merge `overrides` (e.g. the parameters of a queued job) into an unresolved config. A voice whose
+    reference audio or text is overridden does not inherit the `ref_file` of `config`, which would
+    replace its `ref_text` when resolving, nor its `ref_meta` when the audio changes.
+    """
+    overrides = copy.deepcopy(dict(overrides))
+    for voice_info in (overrides.get("voices") or {}).values():
+        if ("ref_text" in voice_info or "ref_audio" in voice_info) and "ref_file" not in voice_info:
+            voice_info["ref_file"] = ""
+        if "ref_audio" in voice_info and "ref_meta" not in voice_info:
+            voice_info["ref_meta"] = ""
+    return OmegaConf.merge(config, overrides)
+
+
+VOICE_KEYS = ("ref_audio", "ref_text", "ref_file", "ref_meta")
+
+
+def validate_overrides(config_base, overrides: dict):
+    """
+    Check that `overrides` (e.g. the parameters of a queued job) only uses keys of the config
+    schema defined by `config_base`. Voices may be added freely but only with the known voice keys.
+
+    Raises:
+        ValueError: On the first unknown key.
+    """
+    for key, value in overrides.items():
+        if key not in config_base:
+            raise ValueError(f"Unknown config key '{key}'")
+        if key == "voices":
+            for voice_key, voice_info in value.items():
+                unknown = [k for k in voice_info if k not in VOICE_KEYS]
+                if unknown:
+                    raise ValueError(f"Unknown keys {unknown} in voice '{voice_key}', expected some of {VOICE_KEYS}")
@@ -1,14 +1,326 @@
 import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from loguru import logger
 import numpy as np
 import soundfile as sf
+import torch
+import torchaudio
 from pathlib import Path
+from f5_tts.model.utils import convert_char_to_pinyin
 from f5_tts.infer.utils_infer import (
-    infer_process,
+    device,
+    hop_length,
+    target_sample_rate,
     preprocess_ref_audio_text,
     remove_silence_for_generated_wav,
 )
 
+from .chunk_archive import ChunkArchive, chunk_file_name
+from .chunking import reference_max_chars, schedule_chunks
+from .mel_store import MelStore
+from .memory_budget import SegmentBuffer, StageMemory
+from .script_merge import merged_text, plan_merges, split_merged_wave
+from .speaking_rate import (
+    count_units,
+    default_metadata_path,
+    estimate_frames,
+    load_voice_metadata,
+    observe_chunk,
+    save_voice_metadata,
+    speech_bounds,
+    update_rate,
+)
+
+
+class InferenceCancelled(Exception):
+    """Raised by `run_inference` when its `cancel_check` callback asks to stop."""
+
+
+def load_reference_audio(ref_audio, target_rms):
+    """
+    Load a (preprocessed) reference audio the way f5_tts `infer_batch_process` does:
+    mono, raised to `target_rms` if quieter, resampled to the model sample rate.
+
+    Returns:
+        tuple: (audio tensor (1, n) on the inference device, original rms, original duration in seconds)
+    """
+    audio, sr = torchaudio.load(ref_audio)
+    duration = audio.shape[-1] / sr
+    if audio.shape[0] > 1:
+        audio = torch.mean(audio, dim=0, keepdim=True)
+
+    rms = torch.sqrt(torch.mean(torch.square(audio)))
+    if rms < target_rms:
+        audio = audio * target_rms / rms
+    if sr != target_sample_rate:
+        resampler = torchaudio.transforms.Resample(sr, target_sample_rate)
+        audio = resampler(audio)
+    return audio.to(device), rms, duration
+
+
+@dataclass
+class VoiceConditioning:
+    """
+    Everything the sampler needs from a reference voice, computed once per voice and reused by
+    every chunk: the reference mel (the model conditioning), its length in frames, the reference
+    text as fed to the model, and the gain bringing generated audio back to the reference loudness.
+    """
+    cond: torch.Tensor
+    cond_frames: int
+    ref_text: str
+    ref_duration: float
+    max_chars: int
+    rms_scale: float
+
+
+def build_conditioning(ref_audio: str, ref_text: str, ema_model, target_rms: float):
+    """Load a (preprocessed) reference voice and compute its mel conditioning with the model's own mel extractor."""
+    audio, rms, ref_duration = load_reference_audio(ref_audio, target_rms)
+    with torch.inference_mode():
+        # Same transform as CFM.sample applies to a raw waveform cond, done once instead of once per chunk
+        cond = ema_model.mel_spec(audio).permute(0, 2, 1)
+
+    max_chars = reference_max_chars(ref_text, ref_duration)
+    if len(ref_text[-1].encode("utf-8")) == 1:
+        ref_text = ref_text + " "
+    return VoiceConditioning(
+        cond=cond,
+        cond_frames=audio.shape[-1] // hop_length,
+        ref_text=ref_text,
+        ref_duration=ref_duration,
+        max_chars=max_chars,
+        # Generated audio is brought back to the loudness of quiet references
+        rms_scale=float(rms / target_rms) if rms < target_rms else 1.0,
+    )
+
+
+class VoiceCache(OrderedDict):
+    """
+    Voice conditionings of one model, the least recently used dropped beyond `max_voices`.
+    A long-lived process (e.g. a job worker) holds one per loaded model.
+    """
+
+    def __init__(self, max_voices: int = 64):
+        super().__init__()
+        self.max_voices = max_voices
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_voices:
+            self.popitem(last=False)
+
+
+def conditioning_key(voice_info, mel_spec_type: str, target_rms: float):
+    return (voice_info["ref_audio"], voice_info["ref_text"], mel_spec_type, target_rms)
+
+
+def get_conditioning(voice_cache: dict, voice_info, ema_model, mel_spec_type: str, target_rms: float):
+    """Return the conditioning of a voice from `voice_cache`, building it on first use."""
+    key = conditioning_key(voice_info, mel_spec_type, target_rms)
+    if key not in voice_cache:
+        voice_cache[key] = build_conditioning(voice_info["ref_audio"], voice_info["ref_text"], ema_model, target_rms)
+    return voice_cache[key]
+
+
+def decode_mel(mel_spec, vocoder, mel_spec_type: str, rms_scale: float = 1.0):
+    """Vocode a (1, n_mels, frames) mel tensor and return the float32 wave, scaled by `rms_scale`."""
+    with torch.inference_mode():
+        if mel_spec_type == "vocos":
+            generated_wave = vocoder.decode(mel_spec)
+        elif mel_spec_type == "bigvgan":
+            generated_wave = vocoder(mel_spec)
+        else:
+            raise ValueError(f"Invalid mel spec type '{mel_spec_type}'")
+        generated_wave = generated_wave * rms_scale
+        return generated_wave.squeeze().cpu().numpy()
+
+
+def generate_chunks(
+    voice: VoiceConditioning,
+    text_batches: list,
+    ema_model,
+    vocoder,
+    mel_spec_type: str,
+    nfe_step: int,
+    cfg_strength: float,
+    sway_sampling_coef: float,
+    speed: float,
+    fix_duration: float,
+    speaking_rate: float = None,
+    on_chunk=None,
+):
+    """
+    Generate every text chunk, like f5_tts `infer_batch_process` but one chunk at a time so that
+    callers see each chunk as soon as it is ready: `on_chunk(chunk)` is called after each chunk
+    with a dict holding its 'index', 'text', 'wave', 'mel' and 'rms_scale'.
+
+    The voice conditioning is passed as a precomputed mel, so the reference is not reloaded nor
+    re-analysed for each chunk. With a calibrated `speaking_rate` (units per second, see
+    `speaking_rate.py`) the generated duration is predicted from it instead of from the
+    reference text/audio length ratio.
+
+    Returns:
+        tuple: (list of float32 waves, list of (n_mels, frames) spectrograms)
+    """
+    ref_text = voice.ref_text
+    ref_audio_len = voice.cond_frames
+    rms_scale = voice.rms_scale
+
+    waves, mels = [], []
+    for i, gen_text in enumerate(text_batches):
+        final_text_list = convert_char_to_pinyin([ref_text + gen_text])
+
+        if fix_duration is not None:
+            duration = int(fix_duration * target_sample_rate / hop_length)
+        elif speaking_rate and count_units(gen_text):
+            duration = ref_audio_len + estimate_frames(gen_text, speaking_rate, target_sample_rate / hop_length, speed)
+        else:
+            ref_text_len = len(ref_text.encode("utf-8"))
+            gen_text_len = len(gen_text.encode("utf-8"))
+            duration = ref_audio_len + int(ref_audio_len / ref_text_len * gen_text_len / speed)
+
+        with torch.inference_mode():
+            generated, _ = ema_model.sample(
+                cond=voice.cond,
+                text=final_text_list,
+                duration=duration,
+                steps=nfe_step,
+                cfg_strength=cfg_strength,
+                sway_sampling_coef=sway_sampling_coef,
+            )
+            generated = generated.to(torch.float32)
+            generated = generated[:, ref_audio_len:, :]
+            generated_mel_spec = generated.permute(0, 2, 1)
+            wave = decode_mel(generated_mel_spec, vocoder, mel_spec_type, rms_scale)
+            mel = generated_mel_spec[0].cpu().numpy()
+
+        waves.append(wave)
+        mels.append(mel)
+        if on_chunk is not None:
+            on_chunk({'index': i, 'text': gen_text, 'wave': wave, 'mel': mel, 'rms_scale': rms_scale})
+
+    return waves, mels
+
+
+def cross_fade_concat(waves: list, cross_fade_duration: float, sample_rate: int = target_sample_rate):
+    """
+    Concatenate chunk waves with linear cross-fades, as f5_tts `infer_batch_process` does, into
+    one preallocated float32 array (instead of re-concatenating the growing wave at every chunk).
+    """
+    if not waves:
+        return np.array([], dtype=np.float32)
+    if cross_fade_duration <= 0:
+        return np.concatenate(waves).astype(np.float32, copy=False)
+
+    overlaps = []
+    length = len(waves[0])
+    for next_wave in waves[1:]:
+        cross_fade_samples = max(min(int(cross_fade_duration * sample_rate), length, len(next_wave)), 0)
+        overlaps.append(cross_fade_samples)
+        length += len(next_wave) - cross_fade_samples
+
+    final_wave = np.empty(length, dtype=np.float32)
+    end = len(waves[0])
+    final_wave[:end] = waves[0]
+    for next_wave, cross_fade_samples in zip(waves[1:], overlaps):
+        start = end - cross_fade_samples
+        if cross_fade_samples > 0:
+            fade_in = np.linspace(0, 1, cross_fade_samples, dtype=np.float32)
+            final_wave[start:end] = final_wave[start:end] * fade_in[::-1] + next_wave[:cross_fade_samples] * fade_in
+        final_wave[end:start + len(next_wave)] = next_wave[cross_fade_samples:]
+        end = start + len(next_wave)
+    return final_wave
+
+
+def synthesize_text(
+    voice: VoiceConditioning,
+    gen_text: str,
+    ema_model,
+    vocoder,
+    mel_spec_type: str,
+    cross_fade_duration: float,
+    nfe_step: int,
+    cfg_strength: float,
+    sway_sampling_coef: float,
+    speed: float,
+    fix_duration: float,
+    chunk_schedule: str = "default",
+    first_chunk_max_chars: int = 80,
+    chunk_growth: float = 2.0,
+    speaking_rate: float = None,
+    on_chunk=None,
+    chunk_pool=None,
+    keep_spectrogram: bool = True,
+):
+    """
+    Chunk `gen_text` with `chunk_schedule`, generate the chunks with the `voice` conditioning
+    (see `build_conditioning`) and cross-fade them. With a `chunk_pool` (see `ChunkWorkerPool`)
+    the chunks are generated in parallel worker processes.
+
+    Returns:
+        tuple: (wave, sample rate, spectrogram, timings) where timings holds 'first_audio' (seconds
+        until the first chunk was ready), 'total' (seconds) and 'n_chunks'. The spectrogram is
+        None with `keep_spectrogram=False`.
+    """
+    start = time.perf_counter()
+    timings = {'first_audio': None, 'total': None, 'n_chunks': 0}
+
+    def _on_chunk(chunk):
+        if timings['first_audio'] is None:
+            timings['first_audio'] = time.perf_counter() - start
+        if on_chunk is not None:
+            on_chunk(chunk)
+
+    text_batches = schedule_chunks(gen_text, voice.max_chars, schedule=chunk_schedule,
+                                   first_chunk_max_chars=first_chunk_max_chars, growth=chunk_growth)
+    logger.debug(f"Generating audio in {len(text_batches)} chunks ({chunk_schedule} schedule): {text_batches}")
+
+    params = dict(
+        nfe_step=nfe_step,
+        cfg_strength=cfg_strength,
+        sway_sampling_coef=sway_sampling_coef,
+        speed=speed,
+        fix_duration=fix_duration,
+        speaking_rate=speaking_rate,
+    )
+    if chunk_pool is not None and len(text_batches) > 1:
+        waves, mels = chunk_pool.generate(voice, text_batches, on_chunk=_on_chunk, **params)
+    else:
+        waves, mels = generate_chunks(voice, text_batches, ema_model, vocoder, mel_spec_type=mel_spec_type,
+                                      on_chunk=_on_chunk, **params)
+    final_wave = cross_fade_concat(waves, cross_fade_duration)
+    del waves
+    spectrogram = np.concatenate(mels, axis=1) if keep_spectrogram else None
+    del mels
+
+    timings['total'] = time.perf_counter() - start
+    timings['n_chunks'] = len(text_batches)
+    return final_wave, target_sample_rate, spectrogram, timings
+
+
+def prepare_voices(voices_cfg: dict):
+    """
+    Preprocess the reference audio and text of every voice in place (clipping, silence trimming,
+    transcription if the text is empty). Pass `voices_prepared=True` to `run_inference` to reuse
+    the result across several runs.
+    """
+    for voice_key, voice_info in voices_cfg.items():
+        if not voice_info.get("ref_meta"):
+            voices_cfg[voice_key]["ref_meta"] = default_metadata_path(voice_info.get("ref_audio"))
+        ref_audio_processed, ref_text_processed = preprocess_ref_audio_text(voice_info.get("ref_audio"), voice_info.get("ref_text"))
+        voices_cfg[voice_key]["ref_audio"] = ref_audio_processed
+        voices_cfg[voice_key]["ref_text"] = ref_text_processed
+    logger.info("All voices have been preprocessed.")
+    return voices_cfg
+
 
 def run_inference(
     voices_cfg: dict,
@@ -28,13 +340,36 @@ def run_inference(
     output_dir: str = None,
     output_file: str = None,
     remove_silence: bool = False,
+    chunk_schedule: str = "default",
+    first_chunk_max_chars: int = 80,
+    chunk_growth: float = 2.0,
+    voices_prepared: bool = False,
+    save_mel: bool = False,
+    cancel_check=None,
+    voice_cache: dict = None,
+    use_speaking_rate: bool = False,
+    learn_speaking_rate: bool = False,
+    merge_max_chars: int = 0,
+    chunk_pool=None,
+    chunk_archive: bool = False,
+    memory_budget_mb: float = None,
 ):
-    
-    for voice_key, voice_info in voices_cfg.items():
-        ref_audio_processed, ref_text_processed = preprocess_ref_audio_text(voice_info.get("ref_audio"), voice_info.get("ref_text"))
-        voices_cfg[voice_key]["ref_audio"] = ref_audio_processed
-        voices_cfg[voice_key]["ref_text"] = ref_text_processed
-    logger.info("All voices have been preprocessed.")
+
+    # Peak RSS of each stage, reported at the end
+    memory = StageMemory()
+    if not voices_prepared:
+        with memory.stage("prepare"):
+            prepare_voices(voices_cfg)
+    # Voice conditionings, built once per voice and shared by all segments and chunks (and by later
+    # runs when the caller keeps passing the same dict)
+    if voice_cache is None:
+        voice_cache = {}
+    conditioning_builds, conditioning_time, n_chunks = 0, 0.0, 0
+    conditioning_hits, conditioning_hit_time = 0, 0.0
+    # Per-voice metadata (calibrated speaking rate), observed rates and generated / trailing silence seconds
+    voice_metadata = {}
+    observed_rates = {}
+    generated_seconds, silence_seconds = 0.0, 0.0
 
     default_voice_key = list(voices_cfg.keys())[0]
 
@@ -48,54 +383,190 @@ def run_inference(
         segments.append((default_voice_key, gen_text))
 
     chunk_dir = None
-    if save_chunk and output_dir and output_file:
-        chunk_dir = os.path.join(output_dir, f"{Path(output_file).stem}_chunks")
-        os.makedirs(chunk_dir, exist_ok=True)
-
-    generated_audio_segments = []
+    archive = None
+    mel_store = None
+    generation_params = dict(nfe_step=nfe_step, cfg_strength=cfg_strength, sway_sampling_coef=sway_sampling_coef,
+                             speed=speed, fix_duration=fix_duration, target_rms=target_rms,
+                             cross_fade_duration=cross_fade_duration, vocoder=vocoder_name)
+    # Finished segments, spilled to a temporary file past the memory budget
+    generated_audio_segments = SegmentBuffer(budget_bytes=memory_budget_mb * 1024 ** 2 if memory_budget_mb else None)
     final_sample_rate = 24000  # default fallback
 
-    for idx, (voice_key, segment_text) in enumerate(segments):
-
-        if voice_key not in voices_cfg:
-            logger.warning(f"In segment n°{idx}, voice '{voice_key}' not defined in config.voices. Using '{default_voice_key}' voice instead.")
-            voice_key = default_voice_key
-
-        ref_audio_ = voices_cfg[voice_key]["ref_audio"]
-        ref_text_ = voices_cfg[voice_key]["ref_text"]
-
-        if not segment_text.strip():
-            logger.debug(f"Skipping empty text in segment {idx}.")
-            continue
-
-        audio_segment, final_sample_rate, spectragram = infer_process(
-            ref_audio_,
-            ref_text_,
-            segment_text,
-            ema_model,
-            vocoder,
-            mel_spec_type=vocoder_name,
-            target_rms=target_rms,
-            cross_fade_duration=cross_fade_duration,
-            nfe_step=nfe_step,
-            cfg_strength=cfg_strength,
-            sway_sampling_coef=sway_sampling_coef,
-            speed=speed,
-            fix_duration=fix_duration,
-        )
-        generated_audio_segments.append(audio_segment)
-
-        if chunk_dir:
-            chunk_fname = f"{idx:03d}_{voice_key}.wav"
-            chunk_out_path = os.path.join(chunk_dir, chunk_fname)
-            sf.write(chunk_out_path, audio_segment, final_sample_rate)
-            logger.debug(f"Saved chunk {idx} for voice '{voice_key}'")
+    try:
+        if save_chunk and output_dir and output_file and chunk_archive:
+            archive = ChunkArchive(chunk_archive_dir(output_dir, output_file), mode="w")
+        elif save_chunk and output_dir and output_file:
+            chunk_dir = os.path.join(output_dir, f"{Path(output_file).stem}_chunks")
+            os.makedirs(chunk_dir, exist_ok=True)
 
-    if generated_audio_segments:
-        final_wave = np.concatenate(generated_audio_segments)
-    else:
-        final_wave = np.array([], dtype=np.float32)
+        if save_mel and output_dir and output_file:
+            mel_store = MelStore.create(mel_store_dir(output_dir, output_file),
+                                        sample_rate=target_sample_rate,
+                                        mel_spec_type=vocoder_name,
+                                        cross_fade_duration=cross_fade_duration,
+                                        output_file=output_file)
+
+        entries = []
+        for idx, (voice_key, segment_text) in enumerate(segments):
+
+            if voice_key not in voices_cfg:
+                logger.warning(f"In segment n°{idx}, voice '{voice_key}' not defined in config.voices. Using '{default_voice_key}' voice instead.")
+                voice_key = default_voice_key
+
+            if not segment_text.strip():
+                logger.debug(f"Skipping empty text in segment {idx}.")
+                continue
+            entries.append((idx, voice_key, segment_text))
+
+        # Optional planning pass: adjacent entries of one voice are generated together, then split back
+        if merge_max_chars:
+            groups = plan_merges(entries, merge_max_chars)
+            logger.info(f"{len(entries)} script entries merged into {len(groups)} generations "
+                        f"({len(entries) - len(groups)} inference calls saved)")
+        else:
+            groups = [[entry] for entry in entries]
+
+        for group in groups:
+            idx, voice_key, _ = group[0]
+            segment_text = merged_text(group)
+
+            # A bounded cache may evict as it grows, so a build is told by the key and not by the size
+            cached = conditioning_key(voices_cfg[voice_key], vocoder_name, target_rms) in voice_cache
+            start = time.perf_counter()
+            with memory.stage("conditioning"):
+                voice = get_conditioning(voice_cache, voices_cfg[voice_key], ema_model, vocoder_name, target_rms)
+            if not cached:
+                conditioning_builds += 1
+                conditioning_time += time.perf_counter() - start
+            else:
+                conditioning_hits += 1
+                conditioning_hit_time += time.perf_counter() - start
+
+            if cancel_check is not None and cancel_check():
+                raise InferenceCancelled(f"Inference cancelled before segment {idx}")
+
+            if voice_key not in voice_metadata:
+                voice_metadata[voice_key] = load_voice_metadata(voices_cfg[voice_key].get("ref_meta"))
+            speaking_rate = voice_metadata[voice_key].get('speaking_rate') if use_speaking_rate else None
+
+            def _on_chunk(chunk, idx=idx, voice_key=voice_key):
+                nonlocal generated_seconds, silence_seconds
+                chunk_seconds = len(chunk['wave']) / target_sample_rate
+                generated_seconds += chunk_seconds
+                silence_seconds += chunk_seconds - speech_bounds(chunk['wave'], target_sample_rate)[1]
+                if learn_speaking_rate:
+                    rate = observe_chunk(chunk['text'], chunk['wave'], target_sample_rate)
+                    if rate is not None:
+                        observed_rates.setdefault(voice_key, []).append(rate)
+                if mel_store is not None:
+                    mel_store.append(chunk['mel'], segment=idx, chunk=chunk['index'], voice=voice_key,
+                                     text=chunk['text'], rms_scale=chunk['rms_scale'])
+                if cancel_check is not None and cancel_check():
+                    raise InferenceCancelled(f"Inference cancelled in segment {idx} after chunk {chunk['index']}")
+
+            with memory.stage("generate"):
+                audio_segment, final_sample_rate, _, timings = synthesize_text(
+                    voice,
+                    segment_text,
+                    ema_model,
+                    vocoder,
+                    mel_spec_type=vocoder_name,
+                    cross_fade_duration=cross_fade_duration,
+                    nfe_step=nfe_step,
+                    cfg_strength=cfg_strength,
+                    sway_sampling_coef=sway_sampling_coef,
+                    speed=speed,
+                    fix_duration=fix_duration,
+                    chunk_schedule=chunk_schedule,
+                    first_chunk_max_chars=first_chunk_max_chars,
+                    chunk_growth=chunk_growth,
+                    speaking_rate=speaking_rate,
+                    on_chunk=_on_chunk,
+                    chunk_pool=chunk_pool,
+                    keep_spectrogram=False,
+                )
+            n_chunks += timings['n_chunks']
+            # A segment may produce no chunk (no first audio) or no samples (no RTF)
+            if timings['first_audio'] is not None and len(audio_segment):
+                logger.debug(f"Segment {idx}: {timings['n_chunks']} chunks, first audio after {timings['first_audio']:.2f}s, "
+                             f"RTF {timings['total'] / (len(audio_segment) / final_sample_rate):.3f}")
+            else:
+                logger.debug(f"Segment {idx}: {timings['n_chunks']} chunks, no audio generated")
+
+            with memory.stage("store"):
+                pieces = split_merged_wave(audio_segment, final_sample_rate, [text for _, _, text in group])
+                for (idx, voice_key, text), piece in zip(group, pieces):
+                    generated_audio_segments.append(piece)
 
+                    if chunk_dir:
+                        chunk_fname = chunk_file_name(idx, voice_key, len(segments))
+                        chunk_out_path = os.path.join(chunk_dir, chunk_fname)
+                        sf.write(chunk_out_path, piece, final_sample_rate)
+                        logger.debug(f"Saved chunk {idx} for voice '{voice_key}'")
+                    elif archive is not None:
+                        archive.append(piece, final_sample_rate, segment=idx, voice=voice_key, text=text, params=generation_params,
+                                       timings={'first_audio': timings['first_audio'], 'total': timings['total'],
+                                                'n_chunks': timings['n_chunks'], 'merged_entries': len(group)})
+                # The pieces are views of the segment: drop both before generating the next one
+                del audio_segment, pieces, piece
+
+        if conditioning_builds:
+            # Without reuse, every chunk would reload the reference and recompute its mel. The saving is
+            # estimated from the measured builds and cache hits of this run, the uncached runs are not timed
+            per_build = conditioning_time / conditioning_builds
+            per_hit = conditioning_hit_time / conditioning_hits if conditioning_hits else 0.0
+            saved = per_build * (n_chunks - conditioning_builds) - per_hit * conditioning_hits
+            logger.info(f"Voice conditioning built {conditioning_builds} times ({per_build * 1000:.1f} ms each) and reused "
+                        f"{conditioning_hits} times ({per_hit * 1000:.3f} ms each) for {n_chunks} chunks, "
+                        f"estimated {max(saved, 0.0):.2f}s of reference processing saved")
+
+        if generated_seconds:
+            logger.info(f"{silence_seconds:.1f}s of trailing silence in {generated_seconds:.1f}s of generated audio "
+                        f"({100 * silence_seconds / generated_seconds:.1f}% of the sampled frames)")
+
+        for voice_key, rates in observed_rates.items():
+            if not voices_cfg[voice_key].get("ref_meta"):
+                continue
+            metadata = update_rate(voice_metadata[voice_key], rates)
+            save_voice_metadata(voices_cfg[voice_key]["ref_meta"], metadata)
+            logger.info(f"Speaking rate of voice '{voice_key}' updated to {metadata['speaking_rate']:.2f} units/s "
+                        f"({len(rates)} new observations)")
+
+        if archive is not None:
+            archive.close()
+            logger.info(f"{len(archive)} chunks archived in {archive.archive_dir}")
+
+        if mel_store is not None:
+            mel_store.close()
+            logger.info(f"Mel spectrograms of {len(mel_store)} chunks stored in {mel_store.store_dir}")
+
+        with memory.stage("assemble"):
+            final_wave = generated_audio_segments.finalize()
+        with memory.stage("write"):
+            write_output(final_wave, final_sample_rate, output_dir, output_file, remove_silence)
+    finally:
+        # Also on errors and cancellations: what was archived so far stays readable, the spill file goes away
+        if archive is not None:
+            archive.close()
+        if mel_store is not None:
+            mel_store.close()
+        generated_audio_segments.close()
+
+    memory.log()
+    return final_wave, final_sample_rate
+
+
+def chunk_archive_dir(output_dir, output_file):
+    """Directory of the chunk archive saved next to `output_file` by `run_inference(save_chunk=True, chunk_archive=True)`."""
+    return os.path.join(output_dir, f"{Path(output_file).stem}_chunk_archive")
+
+
+def mel_store_dir(output_dir, output_file):
+    """Directory of the mel store saved next to `output_file` by `run_inference(save_mel=True)`."""
+    return os.path.join(output_dir, f"{Path(output_file).stem}_mels")
+
+
+def write_output(final_wave, final_sample_rate, output_dir, output_file, remove_silence=False):
     if output_dir and output_file and len(final_wave) > 0:
         os.makedirs(output_dir, exist_ok=True)
         wave_path = Path(output_dir) / output_file
@@ -106,5 +577,49 @@ def run_inference(
             remove_silence_for_generated_wav(str(wave_path))
             logger.debug(f"Silence removed from {wave_path}")
 
-    return final_wave, final_sample_rate
 
+def render_mel_store(
+    store_dir: str,
+    vocoder,
+    vocoder_name: str,
+    cross_fade_duration: float = None,
+    output_dir: str = None,
+    output_file: str = None,
+    remove_silence: bool = False,
+):
+    """
+    Re-render the audio of a `run_inference(save_mel=True)` run from its stored mel spectrograms:
+    only the vocoder, the chunk cross-fade, segment assembly and silence removal are run.
+
+    Parameters:
+        store_dir (str): Mel store directory (see `mel_store_dir`).
+        vocoder: Loaded vocoder.
+        vocoder_name (str): 'vocos' or 'bigvgan'.
+        cross_fade_duration (float): Chunk cross-fade, defaults to the one used at generation.
+
+    Returns:
+        tuple: (final wave, sample rate)
+    """
+    store = MelStore.open(store_dir)
+    if store.meta.get('mel_spec_type') != vocoder_name:
+        logger.warning(f"Mels in {store_dir} were generated for '{store.meta.get('mel_spec_type')}', "
+                       f"rendering them with '{vocoder_name}'")
+    if cross_fade_duration is None:
+        cross_fade_duration = store.meta['cross_fade_duration']
+    sample_rate = store.meta['sample_rate']
+
+    segments = {}
+    for chunk_id, entry in enumerate(store.entries):
+        mel = torch.from_numpy(store.get(chunk_id)).unsqueeze(0).to(device)
+        segments.setdefault(entry['segment'], []).append(decode_mel(mel, vocoder, vocoder_name, entry['rms_scale']))
+    logger.info(f"Vocoded {len(store)} chunks from {store_dir}")
+
+    generated_audio_segments = [cross_fade_concat(waves, cross_fade_duration, sample_rate)
+                                for _, waves in sorted(segments.items())]
+    if generated_audio_segments:
+        final_wave = np.concatenate(generated_audio_segments)
+    else:
+        final_wave = np.array([], dtype=np.float32)
+
+    write_output(final_wave, sample_rate, output_dir, output_file, remove_silence)
+    return final_wave, sample_rate
@@ -0,0 +1,230 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+JOB_STATUSES = ("queued", "running", "done", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    params TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    error TEXT,
+    result TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, priority DESC, id);
+"""
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """
+    Durable, prioritized queue of synthesis jobs stored in a SQLite database.
+
+    A job holds config overrides (`params`) that a worker merges into its base config before
+    calling `run_inference`. Workers `claim` the queued job with the highest priority (oldest
+    first among equal priorities), so short interactive jobs submitted with a higher priority
+    run before queued bulk renders. Failed jobs are re-queued until `max_attempts` is reached.
+
+    Running jobs are cancelled cooperatively: `cancel` sets a flag that the worker polls through
+    `cancel_requested`. A worker keeps its running job alive with `heartbeat` (see `JobHeartbeat`),
+    jobs of a crashed worker stay 'running' until `requeue_stale` puts them back.
+
+    Parameters:
+        db_path (str or Path): SQLite database file, created if missing.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        os.makedirs(self.db_path.parent, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers cannot claim the same job
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _to_dict(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def submit(self, params: dict, priority: int = 0, max_attempts: int = 3):
+        """Queue a job and return its id. Higher `priority` values run first."""
+        cursor = self._conn.execute(
+            "INSERT INTO jobs (priority, params, max_attempts, created_at) VALUES (?, ?, ?, ?)",
+            (priority, json.dumps(params), max_attempts, time.time()),
+        )
+        return cursor.lastrowid
+
+    def claim(self, worker_id=None):
+        """Mark the next queued job as running for `worker_id` and return it, or None if the queue is empty."""
+        worker_id = worker_id or default_worker_id()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY priority DESC, id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                "started_at = ?, heartbeat_at = ?, error = NULL WHERE id = ?",
+                (worker_id, now, now, row['id']),
+            )
+        return self.get(row['id'])
+
+    def heartbeat(self, job_id):
+        """Record that the job is still being worked on."""
+        self._conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def cancel_requested(self, job_id):
+        """Return True if the cancellation of the job was requested."""
+        row = self._conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row['cancel_requested'])
+
+    def complete(self, job_id, result=None):
+        self._conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+            (json.dumps(result), time.time(), job_id),
+        )
+
+    def fail(self, job_id, error: str):
+        """Record a failed attempt: the job is queued again unless it used all its attempts."""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            status = "queued" if row['attempts'] < row['max_attempts'] else "failed"
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+                (status, error, time.time() if status == "failed" else None, job_id),
+            )
+        return status
+
+    def mark_cancelled(self, job_id):
+        """Called by the worker once it stopped a running job whose cancellation was requested."""
+        self._conn.execute(
+            "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'running'",
+            (time.time(), job_id),
+        )
+
+    def cancel(self, job_id):
+        """
+        Cancel a job: a queued job is cancelled at once, a running one is flagged so that its
+        worker stops it. Returns the resulting status, or None if the job does not exist.
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            if row['status'] == "queued":
+                conn.execute("UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ?", (time.time(), job_id))
+                return "cancelled"
+            if row['status'] == "running":
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            return row['status']
+
+    def retry(self, job_id, priority: int = None):
+        """Queue a failed or cancelled job again, with a fresh attempt budget. Returns True if it was re-queued."""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = 'queued', attempts = 0, cancel_requested = 0, error = NULL, finished_at = NULL, "
+            "priority = COALESCE(?, priority) WHERE id = ? AND status IN ('failed', 'cancelled')",
+            (priority, job_id),
+        )
+        return cursor.rowcount == 1
+
+    def requeue_stale(self, stale_after: float = 600):
+        """Queue again the running jobs without heartbeat for `stale_after` seconds (crashed workers). Returns their count."""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'queued' END, worker = NULL "
+            "WHERE status = 'running' AND heartbeat_at < ?",
+            (time.time() - stale_after,),
+        )
+        return cursor.rowcount
+
+    def get(self, job_id):
+        return self._to_dict(self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list(self, status: str = None, limit: int = 100):
+        """Return jobs (most recent first), optionally only those with the given status."""
+        if status is not None and status not in JOB_STATUSES:
+            raise ValueError(f"Invalid job status '{status}', expected one of {JOB_STATUSES}")
+        query = "SELECT * FROM jobs" + (" WHERE status = ?" if status else "") + " ORDER BY id DESC LIMIT ?"
+        args = (status, limit) if status else (limit,)
+        return [self._to_dict(row) for row in self._conn.execute(query, args).fetchall()]
+
+    def counts(self):
+        """Number of jobs per status."""
+        rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {status: 0 for status in JOB_STATUSES} | {row['status']: row['n'] for row in rows}
+
+
+class JobHeartbeat:
+    """
+    Background thread recording the heartbeat of a running job every `interval` seconds, so
+    that the job is not taken for stale while the worker is busy in a long step (model download,
+    assembly, silence removal, writing). It uses its own database connection.
+
+    Parameters:
+        db_path (str or Path): SQLite database file of the queue.
+        job_id (int): Running job.
+        interval (float): Seconds between heartbeats, well below the `requeue_stale` delay.
+    """
+
+    def __init__(self, db_path, job_id: int, interval: float):
+        self.db_path = db_path
+        self.job_id = job_id
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"job-{job_id}-heartbeat", daemon=True)
+
+    def _run(self):
+        queue = JobQueue(self.db_path)
+        try:
+            while True:
+                queue.heartbeat(self.job_id)
+                if self._stop.wait(self.interval):
+                    break
+        finally:
+            queue.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
@@ -0,0 +1,88 @@
+import json
+import os
+from pathlib import Path
+import numpy as np
+
+
+class MelStore:
+    """
+    Append-only store of mel spectrograms: one raw float16 file holding every chunk mel as
+    (frames, n_mels) rows back to back, plus an `index.json` with the offset, size and metadata of
+    each chunk. The data file is read back through a memory map, so a chunk is only loaded when
+    it is accessed.
+
+    Use `MelStore.create` to write a new store and `MelStore.open` to read an existing one.
+
+    Parameters:
+        store_dir (str or Path): Directory holding `mels.f16` and `index.json`.
+        meta (dict): Store-wide metadata (sample rate, mel type, cross-fade duration, ...).
+        entries (list[dict]): Per-chunk metadata, each with 'offset' and 'frames' in rows.
+        n_mels (int): Number of mel channels.
+    """
+
+    DATA_FILE = "mels.f16"
+    INDEX_FILE = "index.json"
+
+    def __init__(self, store_dir, meta=None, entries=None, n_mels=None, writable=False):
+        self.store_dir = Path(store_dir)
+        self.meta = dict(meta or {})
+        self.entries = list(entries or [])
+        self.n_mels = n_mels
+        self.n_frames = sum(entry['frames'] for entry in self.entries)
+        self._file = None
+        self._data = None
+        if writable:
+            os.makedirs(self.store_dir, exist_ok=True)
+            self._file = open(self.store_dir / self.DATA_FILE, "wb")
+
+    @classmethod
+    def create(cls, store_dir, **meta):
+        return cls(store_dir, meta=meta, writable=True)
+
+    @classmethod
+    def open(cls, store_dir):
+        with open(Path(store_dir) / cls.INDEX_FILE, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        return cls(store_dir, meta=index['meta'], entries=index['entries'], n_mels=index['n_mels'])
+
+    def append(self, mel, **entry):
+        """Append a (n_mels, frames) mel spectrogram with its metadata. Returns the chunk id."""
+        mel = np.asarray(mel)
+        if self.n_mels is None:
+            self.n_mels = mel.shape[0]
+        elif mel.shape[0] != self.n_mels:
+            raise ValueError(f"Expected {self.n_mels} mel channels, got {mel.shape[0]}")
+
+        entry.update(offset=self.n_frames, frames=int(mel.shape[1]))
+        self._file.write(np.ascontiguousarray(mel.T, dtype=np.float16).tobytes())
+        self.entries.append(entry)
+        self.n_frames += entry['frames']
+        return len(self.entries) - 1
+
+    def close(self):
+        """Flush the data file and write the index (atomically, so readers never see a partial one)."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        tmp_path = self.store_dir / f"{self.INDEX_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({'meta': self.meta, 'n_mels': self.n_mels, 'entries': self.entries}, f, indent=2)
+        os.replace(tmp_path, self.store_dir / self.INDEX_FILE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, chunk_id):
+        """Return the (n_mels, frames) float32 mel of `chunk_id`."""
+        if self._data is None:
+            self._data = np.memmap(self.store_dir / self.DATA_FILE, dtype=np.float16, mode='r',
+                                   shape=(self.n_frames, self.n_mels))
+        entry = self.entries[chunk_id]
+        return np.asarray(self._data[entry['offset']:entry['offset'] + entry['frames']], dtype=np.float32).T
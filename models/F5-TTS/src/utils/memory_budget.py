@@ -0,0 +1,153 @@
+import os
+import sys
+import tempfile
+import weakref
+from contextlib import contextmanager
+from loguru import logger
+import numpy as np
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes (VmHWM on Linux, ru_maxrss elsewhere), None if unknown."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def reset_peak_rss():
+    """Reset the peak RSS to the current RSS (Linux only). Returns False when the peak cannot be reset."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class StageMemory:
+    """
+    Peak RSS of each stage of a run. Stages may repeat (e.g. one per segment), the largest peak is kept.
+    Where the peak cannot be reset (not Linux), the peaks are those of the process so far.
+    """
+
+    def __init__(self):
+        self.peaks = {}
+        self.resettable = reset_peak_rss()
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.resettable:
+            reset_peak_rss()
+        try:
+            yield
+        finally:
+            peak = peak_rss()
+            if peak is not None:
+                self.peaks[name] = max(self.peaks.get(name, 0), peak)
+
+    def log(self):
+        if not self.peaks:
+            return
+        peaks = ", ".join(f"{name} {peak / 1024 ** 2:.0f} MB" for name, peak in self.peaks.items())
+        suffix = "" if self.resettable else " (cumulative, the peak cannot be reset on this platform)"
+        logger.info(f"Peak RSS per stage: {peaks}{suffix}")
+
+
+def _release_spill(mmap, path):
+    # The mapping must be closed before the file can be removed on Windows
+    mmap.close()
+    try:
+        os.remove(path)
+    except OSError:
+        logger.warning(f"Could not remove the spill file {path}")
+
+
+class SegmentBuffer:
+    """
+    Finished float32 audio segments of a run, kept in memory until they exceed `budget_bytes`.
+    From then on, held and later segments are appended to a raw float32 spill file and the final
+    wave is a read-only memory map of that file, so a book-length run holds at most the budget
+    (plus the segment being generated) in memory.
+
+    The spill file is removed once the final wave (and every view of it) is released, or by
+    `close` when the run stops before `finalize`.
+
+    Parameters:
+        budget_bytes (int): Memory allowed for finished segments, None to keep everything in memory.
+        spill_dir (str): Directory of the spill file, the system temporary directory if None.
+    """
+
+    def __init__(self, budget_bytes: int = None, spill_dir: str = None):
+        self.budget_bytes = budget_bytes
+        self.spill_dir = spill_dir
+        self.n_samples = 0
+        self._segments = []
+        self._nbytes = 0
+        self._spill_path = None
+        self._spill_file = None
+
+    @property
+    def spilled(self):
+        return self._spill_file is not None
+
+    def append(self, wave):
+        wave = np.asarray(wave, dtype=np.float32)
+        self.n_samples += wave.size
+        if self._spill_file is not None:
+            self._spill_file.write(wave.tobytes())
+            return
+        self._segments.append(wave)
+        self._nbytes += wave.nbytes
+        if self.budget_bytes is not None and self._nbytes > self.budget_bytes:
+            self._spill()
+
+    def _spill(self):
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+        fd, self._spill_path = tempfile.mkstemp(prefix="segments_", suffix=".f32", dir=self.spill_dir)
+        self._spill_file = os.fdopen(fd, "wb")
+        for wave in self._segments:
+            self._spill_file.write(wave.tobytes())
+        logger.info(f"Memory budget of {self.budget_bytes / 1024 ** 2:.0f} MB reached, "
+                    f"finished segments spilled to {self._spill_path}")
+        self._segments, self._nbytes = [], 0
+
+    def finalize(self):
+        """Return the concatenated wave: an array, or a read-only memory map once spilled."""
+        if self._spill_file is None:
+            segments, self._segments, self._nbytes = self._segments, [], 0
+            if not segments:
+                return np.array([], dtype=np.float32)
+            return np.concatenate(segments)
+
+        self._spill_file.close()
+        self._spill_file = None
+        spill_path, self._spill_path = self._spill_path, None
+        final_wave = np.memmap(spill_path, dtype=np.float32, mode="r", shape=(self.n_samples,))
+        # Views keep the memory map alive, the file is removed once the last of them is gone
+        weakref.finalize(final_wave, _release_spill, final_wave._mmap, spill_path)
+        return final_wave
+
+    def close(self):
+        """Drop the held segments and remove a spill file not handed out by `finalize`."""
+        self._segments, self._nbytes = [], 0
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        if self._spill_path is not None:
+            try:
+                os.remove(self._spill_path)
+            except OSError:
+                logger.warning(f"Could not remove the spill file {self._spill_path}")
+            self._spill_path = None
@@ -0,0 +1,124 @@
+import gc
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from loguru import logger
+import torch
+
+
+def module_nbytes(module):
+    """Memory held by the parameters and buffers of a torch module, in bytes."""
+    tensors = list(module.parameters()) + list(module.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def model_key(model: str, ckpt_file: str, vocoder_name: str, vocab_file: str):
+    """Registry key of a model, also used to tie caches built with it (e.g. voice conditionings) to its lifetime."""
+    return ("model", model, ckpt_file or "", vocoder_name, vocab_file or "")
+
+
+class ModelRegistry:
+    """
+    In-process cache of loaded models and vocoders, so that one process can serve every
+    (model, checkpoint, vocoder) combination.
+
+    Models and vocoders are separate entries (a vocoder is shared by all the models using it),
+    loaded on first use. Each entry's memory is measured from its parameters and buffers, and the
+    least recently used entries are evicted whenever the total goes above `max_bytes`. The entries
+    just requested (the model and vocoder of `get_for_config`) are never evicted, even if they
+    alone exceed the ceiling.
+
+    Parameters:
+        max_bytes (int): Memory ceiling for all loaded weights, None for no limit.
+        hf_cache_dir (str): Hugging Face cache directory used to download weights.
+    """
+
+    def __init__(self, max_bytes=None, hf_cache_dir=None):
+        self.max_bytes = max_bytes
+        self.hf_cache_dir = hf_cache_dir
+        self._entries = OrderedDict()  # key -> (object, nbytes), least recently used first
+        self._pinned = set()  # keys that must survive the current eviction (e.g. the vocoder of a model being loaded)
+        self._depth = 0
+        self._lock = threading.RLock()
+
+    @property
+    def total_bytes(self):
+        return sum(nbytes for _, nbytes in self._entries.values())
+
+    def loaded(self):
+        """Keys and sizes of the loaded entries, least recently used first."""
+        with self._lock:
+            return [(key, nbytes) for key, (_, nbytes) in self._entries.items()]
+
+    def _get(self, key, loader):
+        with self._pinning():
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._pinned.add(key)
+                return self._entries[key][0]
+
+            obj = loader()
+            nbytes = module_nbytes(obj)
+            self._entries[key] = (obj, nbytes)
+            logger.info(f"Loaded {key} ({nbytes / 1024 ** 2:.0f} MB, {self.total_bytes / 1024 ** 2:.0f} MB in registry)")
+            self._pinned.add(key)
+            self._evict()
+            return obj
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        evicted = False
+        for key in list(self._entries):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if key in self._pinned:
+                continue
+            _, nbytes = self._entries.pop(key)
+            evicted = True
+            logger.info(f"Evicted {key} ({nbytes / 1024 ** 2:.0f} MB)")
+        if self.total_bytes > self.max_bytes:
+            logger.warning(f"{sorted(self._pinned)} alone exceed the registry memory ceiling ({self.max_bytes / 1024 ** 2:.0f} MB)")
+        if evicted:
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+    @contextmanager
+    def _pinning(self):
+        # Entries requested inside the outermost scope cannot evict each other
+        with self._lock:
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._pinned.clear()
+
+    def get_vocoder(self, vocoder_name: str, is_local: bool = False, local_path: str = ""):
+        from f5_tts.infer.utils_infer import load_vocoder
+
+        key = ("vocoder", vocoder_name, bool(is_local), local_path or "")
+        return self._get(key, lambda: load_vocoder(vocoder_name=vocoder_name,
+                                                   is_local=is_local,
+                                                   local_path=local_path,
+                                                   hf_cache_dir=self.hf_cache_dir))
+
+    def get_model(self, model: str, model_cfg: str, ckpt_file: str, vocoder_name: str, vocab_file: str):
+        from .loader import prepare_model
+
+        key = model_key(model, ckpt_file, vocoder_name, vocab_file)
+        return self._get(key, lambda: prepare_model(model=model,
+                                                    model_cfg=model_cfg,
+                                                    ckpt_file=ckpt_file,
+                                                    vocoder_name=vocoder_name,
+                                                    vocab_file=vocab_file,
+                                                    cache_dir=self.hf_cache_dir))
+
+    def get_for_config(self, config):
+        """Return the (ema_model, vocoder) pair selected by a resolved config."""
+        with self._pinning():
+            vocoder = self.get_vocoder(config.vocoder_name, config.vocoder_is_local, config.vocoder_local_path)
+            ema_model = self.get_model(config.model, config.model_cfg, config.ckpt_file, config.vocoder_name, config.vocab_file)
+            return ema_model, vocoder
@@ -0,0 +1,87 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from loguru import logger
+import torch
+import torch.multiprocessing
+
+
+# Model and vocoder of a pool worker process, set once by `_init_worker`
+_worker = {}
+
+
+def _init_worker(ema_model, vocoder, mel_spec_type, n_threads):
+    torch.set_num_threads(n_threads)
+    _worker.update(ema_model=ema_model, vocoder=vocoder, mel_spec_type=mel_spec_type)
+
+
+def _generate_chunk(voice, gen_text, params):
+    from .inference import generate_chunks
+
+    waves, mels = generate_chunks(voice, [gen_text], _worker['ema_model'], _worker['vocoder'],
+                                  mel_spec_type=_worker['mel_spec_type'], **params)
+    return waves[0], mels[0]
+
+
+class ChunkWorkerPool:
+    """
+    Pool of CPU worker processes generating the chunks of one text in parallel.
+
+    The model and vocoder weights are moved to shared memory once and handed to the workers,
+    so every worker uses the same copy. Torch intra-op threads are split between the workers
+    (`threads_per_worker`, by default the available CPUs divided by `n_workers`), so the pool fills
+    the machine without oversubscribing it. Chunk results are returned in text order.
+
+    Parameters:
+        ema_model: Loaded F5-TTS / E2-TTS model (on CPU).
+        vocoder: Loaded vocoder (on CPU).
+        mel_spec_type (str): 'vocos' or 'bigvgan'.
+        n_workers (int): Number of worker processes.
+        threads_per_worker (int): Torch threads per worker.
+    """
+
+    def __init__(self, ema_model, vocoder, mel_spec_type: str, n_workers: int, threads_per_worker: int = None):
+        if next(ema_model.parameters()).device.type != "cpu":
+            raise ValueError("The chunk worker pool is meant for CPU inference, the model is on "
+                             f"{next(ema_model.parameters()).device}")
+        self.n_workers = n_workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // n_workers)
+
+        ema_model.share_memory()
+        vocoder.share_memory()
+        self._executor = ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=torch.multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(ema_model, vocoder, mel_spec_type, self.threads_per_worker),
+        )
+        logger.info(f"Chunk worker pool started: {n_workers} workers x {self.threads_per_worker} threads")
+
+    def generate(self, voice, text_batches: list, on_chunk=None, **params):
+        """
+        Generate `text_batches` in parallel, same arguments and results as `generate_chunks`.
+        `on_chunk` is called in chunk order, as soon as each chunk and the ones before it are done.
+        """
+        futures = [self._executor.submit(_generate_chunk, voice, gen_text, params) for gen_text in text_batches]
+        waves, mels = [], []
+        try:
+            for i, (gen_text, future) in enumerate(zip(text_batches, futures)):
+                wave, mel = future.result()
+                waves.append(wave)
+                mels.append(mel)
+                if on_chunk is not None:
+                    on_chunk({'index': i, 'text': gen_text, 'wave': wave, 'mel': mel, 'rms_scale': voice.rms_scale})
+        except BaseException:
+            # e.g. a cancellation raised by `on_chunk`: drop the chunks not started yet
+            for future in futures:
+                future.cancel()
+            raise
+        return waves, mels
+
+    def close(self):
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,75 @@
+import numpy as np
+
+from .chunking import _join, _nbytes
+from .speaking_rate import count_units, speech_bounds
+
+
+def plan_merges(segments: list, max_chars: int):
+    """
+    Group adjacent script entries of the same voice so that they are generated in one call.
+
+    Parameters:
+        segments (list): (index, voice key, text) entries, in script order.
+        max_chars (int): Maximum size in bytes of the merged text of a group.
+
+    Returns:
+        list[list]: The groups of entries, in order. Entries larger than `max_chars` stay alone.
+    """
+    groups = []
+    merged_text = ""
+    for segment in segments:
+        _, voice_key, text = segment
+        if (groups and groups[-1][-1][1] == voice_key
+                and _nbytes(_join(merged_text, text.strip())) <= max_chars):
+            groups[-1].append(segment)
+            merged_text = _join(merged_text, text.strip())
+        else:
+            groups.append([segment])
+            merged_text = text.strip()
+    return groups
+
+
+def merged_text(group: list):
+    text = ""
+    for _, _, entry_text in group:
+        text = _join(text, entry_text.strip())
+    return text
+
+
+def split_merged_wave(wave, sample_rate: int, texts: list, search_window: float = 0.5, frame_duration: float = 0.01):
+    """
+    Split the audio of merged entries back into one wave per entry.
+
+    The expected boundary between two entries is placed proportionally to the spoken units of
+    the texts (see `count_units`) within the speech span of `wave`. The cut is then moved to the
+    quietest frame within `search_window` seconds (at most a quarter of an entry), which is the
+    pause the model leaves between sentences.
+
+    Returns:
+        list[np.ndarray]: One wave per text, concatenating back to `wave`.
+    """
+    if len(texts) == 1:
+        return [wave]
+
+    frame = max(1, int(frame_duration * sample_rate))
+    n_frames = len(wave) // frame
+    energy = np.mean(np.square(wave[:n_frames * frame].reshape(n_frames, frame)), axis=1)
+
+    units = np.array([max(count_units(text), 1) for text in texts], dtype=np.float64)
+    start, end = speech_bounds(wave, sample_rate)
+    if end <= start:
+        start, end = 0.0, len(wave) / sample_rate
+    targets = start + np.cumsum(units)[:-1] / units.sum() * (end - start)
+    window = min(search_window, 0.25 * (end - start) / len(texts))
+
+    cuts = [0]
+    for target in targets:
+        lo = max(int((target - window) / frame_duration), cuts[-1] // frame + 1)
+        hi = min(int((target + window) / frame_duration) + 1, n_frames)
+        if hi > lo:
+            cut_frame = lo + int(np.argmin(energy[lo:hi]))
+        else:
+            cut_frame = min(max(int(target / frame_duration), lo), n_frames)
+        cuts.append(min(cut_frame * frame + frame // 2, len(wave)))
+    cuts.append(len(wave))
+    return [wave[a:b] for a, b in zip(cuts[:-1], cuts[1:])]
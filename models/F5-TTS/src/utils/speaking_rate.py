@@ -0,0 +1,110 @@
+import json
+import os
+from pathlib import Path
+import numpy as np
+import soundfile as sf
+
+
+# Generated speech gets this much more time than the calibrated rate predicts: a slightly long
+# estimate only costs a few frames of trailing silence, a short one makes the model rush
+DURATION_MARGIN = 1.1
+# A generated chunk only tells its natural speaking rate if the sampler had room to spare,
+# i.e. if it ends with at least this much silence
+MIN_TRAILING_SILENCE = 0.2
+# Weight of a new observation once the running average has enough history
+MIN_UPDATE_WEIGHT = 0.05
+
+
+def count_units(text: str):
+    """Number of spoken units of `text`: letters and digits (a CJK character counts as one)."""
+    return sum(1 for c in text if c.isalnum())
+
+
+def speech_bounds(wave, sample_rate, threshold_db=-40.0, frame_duration=0.02):
+    """
+    Start and end time (seconds) of the speech in `wave`: the first and last frames whose RMS is
+    above `threshold_db` relative to the loudest frame. Returns (0, 0) for silence.
+    """
+    frame = max(1, int(frame_duration * sample_rate))
+    n_frames = len(wave) // frame
+    if n_frames == 0:
+        return 0.0, 0.0
+    rms = np.sqrt(np.mean(np.square(wave[:n_frames * frame].reshape(n_frames, frame)), axis=1))
+    level = 20 * np.log10(rms + 1e-10)
+    voiced = np.flatnonzero(level > level.max() + threshold_db)
+    if voiced.size == 0 or rms.max() < 1e-6:
+        return 0.0, 0.0
+    return voiced[0] * frame_duration, (voiced[-1] + 1) * frame_duration
+
+
+def measure_rate(text, wave, sample_rate):
+    """Speaking rate (units per second) of `wave` saying `text`, None if it cannot be measured."""
+    start, end = speech_bounds(wave, sample_rate)
+    units = count_units(text)
+    if end <= start or units == 0:
+        return None
+    return float(units / (end - start))
+
+
+def default_metadata_path(ref_audio):
+    return str(Path(ref_audio).with_suffix(".json"))
+
+
+def load_voice_metadata(path):
+    if path and os.path.isfile(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_voice_metadata(path, metadata):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def calibrate_reference(ref_audio, ref_text, metadata=None):
+    """Measure the speaking rate of a reference clip and store it in `metadata` (returned)."""
+    metadata = dict(metadata or {})
+    wave, sample_rate = sf.read(ref_audio, dtype="float32", always_2d=True)
+    rate = measure_rate(ref_text, wave.mean(axis=1), sample_rate)
+    if rate is None:
+        raise ValueError(f"Could not measure a speaking rate on '{ref_audio}'")
+    metadata['reference_rate'] = rate
+    metadata.setdefault('speaking_rate', rate)
+    metadata.setdefault('n_observations', 0)
+    return metadata
+
+
+def update_rate(metadata, observed_rates):
+    """
+    Fold speaking rates observed on generated chunks into the running average of `metadata`,
+    the reference rate counting as the first observation.
+    """
+    metadata = dict(metadata)
+    rate = metadata.get('speaking_rate')
+    n = metadata.get('n_observations', 0)
+    for observed in observed_rates:
+        n += 1
+        weight = max(1.0 / (n + 1), MIN_UPDATE_WEIGHT)
+        rate = observed if rate is None else (1 - weight) * rate + weight * observed
+    metadata['speaking_rate'] = rate
+    metadata['n_observations'] = n
+    return metadata
+
+
+def observe_chunk(text, wave, sample_rate):
+    """
+    Speaking rate shown by a generated chunk, or None if the chunk is not a reliable observation
+    (no trailing silence means the sampler may have rushed the speech to fit the duration).
+    """
+    start, end = speech_bounds(wave, sample_rate)
+    if end <= start or len(wave) / sample_rate - end < MIN_TRAILING_SILENCE:
+        return None
+    return measure_rate(text, wave, sample_rate)
+
+
+def estimate_frames(gen_text, speaking_rate, frames_per_second, speed=1.0):
+    """Number of mel frames needed to say `gen_text` at `speaking_rate` units per second."""
+    return int(count_units(gen_text) / speaking_rate * frames_per_second * DURATION_MARGIN / speed)
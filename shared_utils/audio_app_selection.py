@@ -1,16 +1,17 @@
 import argparse
+import functools
 import os
-import dash
-from dash import dcc, html, Input, Output, State, callback_context, no_update, dash_table
-import plotly.graph_objs as go
+import threading
 import numpy as np
 import wave
-import struct
 from pathlib import Path
 import base64
 from loguru import logger
 
 from .utils_audio import run_ffmpeg_command, normalize_audio
+from .spectrogram_tiles import SpectrogramTiles
+from .voice_activity import suggest_reference_clips
+from .workspaces import SessionWorkspaces, atomic_output, new_session_id
 
 
 def read_audio_file(file_path):
@@ -23,31 +24,53 @@ def read_audio_file(file_path):
         raw_data = wf.readframes(n_frames)
 
     if samp_width == 1:
-        fmt_char = 'b'
+        dtype = 'i1'
     elif samp_width == 2:
-        fmt_char = 'h'
+        dtype = '<i2'
     elif samp_width == 4:
-        fmt_char = 'i'
+        dtype = '<i4'
     else:
         raise ValueError("Unsupported sample width")
 
-    total_samples = n_frames * n_channels
-    fmt = "<" + fmt_char * total_samples
-    data = struct.unpack(fmt, raw_data)
+    # Ignore a trailing partial frame, some encoders pad the data chunk
+    frame_bytes = samp_width * n_channels
+    raw_data = raw_data[:len(raw_data) - len(raw_data) % frame_bytes]
+    data = np.frombuffer(raw_data, dtype=dtype)
 
     # For waveform visualization, just use the first channel
     if n_channels > 1:
         data = data[0::n_channels]
 
-    data = np.array(data)
     duration = n_frames / float(framerate)
     times = np.linspace(0, duration, num=len(data))
 
     return times, data, framerate, n_channels, samp_width
 
 
+def read_wav_format(file_path):
+    """Return (framerate, n_channels) of a WAV file from its header only."""
+    with wave.open(str(file_path), 'rb') as wf:
+        return wf.getframerate(), wf.getnchannels()
+
+
+@functools.lru_cache(maxsize=8)
+def _load_audio_cached(file_path, mtime_ns):
+    return read_audio_file(file_path)
+
+
+def load_audio(file_path):
+    """
+    Same as `read_audio_file`, but the decoded audio is shared by every session of the server
+    and only decoded again when the file changes on disk.
+    """
+    return _load_audio_cached(str(file_path), os.stat(file_path).st_mtime_ns)
+
+
 def create_segment_file(segment, index, temp_dir, input_file, framerate, n_channels, ffmpeg_path):
-    """Create a temporary WAV file for a single segment or silence."""
+    """
+    Create a temporary WAV file for a single segment or silence.
+    Segments are cut from their own 'source' file if they have one, from `input_file` otherwise.
+    """
     out_file = os.path.join(temp_dir, f"segment_{index}.wav")
     #if out_file.exists():
     #    out_file.unlink()
@@ -59,7 +82,7 @@ def create_segment_file(segment, index, temp_dir, input_file, framerate, n_chann
         if duration <= 0:
             raise ValueError("Invalid segment duration.")
         cmd = [
-            ffmpeg_path, '-y', '-i', input_file,
+            ffmpeg_path, '-y', '-i', str(segment.get('source') or input_file),
             '-ss', str(start), '-t', str(duration),
             '-ar', str(framerate),      # match original sample rate
             '-ac', str(n_channels),     # match original channel count
@@ -83,11 +106,18 @@ def create_segment_file(segment, index, temp_dir, input_file, framerate, n_chann
     return out_file
 
 
-def generate_preview(segments, framerate, n_channels, temp_dir, input_file, ffmpeg_path):
-    """Generate a preview WAV file by concatenating all segments."""
-    print(segments)
+def generate_preview(segments, framerate, n_channels, temp_dir, input_file, ffmpeg_path, progress_callback=None, output_file=None):
+    """
+    Generate a preview WAV file by concatenating all segments.
+
+    `temp_dir` receives the intermediate files and must not be shared with a concurrent job.
+    The preview is atomically written to `output_file` (defaults to 'final_preview.wav' in `temp_dir`).
+    `progress_callback(done, total)` is called after each ffmpeg step if given.
+    """
+    total_steps = len(segments) + 2
+    report = progress_callback or (lambda done, total: None)
     preview_file = os.path.join(temp_dir, "preview_temp.wav")
-    final_preview = os.path.join(temp_dir, "final_preview.wav")
+    final_preview = output_file or os.path.join(temp_dir, "final_preview.wav")
     # if os.path.exists(preview_file):
     #     preview_file.unlink()
     # if os.path.exists(final_preview):
@@ -97,7 +127,10 @@ def generate_preview(segments, framerate, n_channels, temp_dir, input_file, ffmp
     #for f in temp_dir.glob("segment_*.wav"):
     #    f.unlink()
 
-    segment_files = [create_segment_file(seg, i, temp_dir, input_file, framerate, n_channels, ffmpeg_path) for i, seg in enumerate(segments)]
+    segment_files = []
+    for i, seg in enumerate(segments):
+        segment_files.append(create_segment_file(seg, i, temp_dir, input_file, framerate, n_channels, ffmpeg_path))
+        report(i + 1, total_steps)
 
     concat_file = os.path.join(temp_dir, "concat_list.txt")
     with open(concat_file, 'w') as f:
@@ -110,14 +143,17 @@ def generate_preview(segments, framerate, n_channels, temp_dir, input_file, ffmp
         '-c', 'copy', str(preview_file)
     ]
     run_ffmpeg_command(cmd_concat)
+    report(total_steps - 1, total_steps)
 
     # Re-encode the concatenated file to a standard PCM WAV
-    cmd_encode = [
-        ffmpeg_path, '-y', '-i', str(preview_file),
-        '-c:a', 'pcm_s16le',
-        str(final_preview)
-    ]
-    run_ffmpeg_command(cmd_encode)
+    with atomic_output(final_preview) as tmp_preview:
+        cmd_encode = [
+            ffmpeg_path, '-y', '-i', str(preview_file),
+            '-c:a', 'pcm_s16le',
+            str(tmp_preview)
+        ]
+        run_ffmpeg_command(cmd_encode)
+    report(total_steps, total_steps)
 
     return final_preview
 
@@ -131,14 +167,10 @@ def file_to_data_uri(file_path):
 
 
 
-def create_dash_app(assets_dir, temp_dir, input_file, ffmpeg_path):
-
-    os.makedirs(assets_dir, exist_ok=True)
-    os.makedirs(temp_dir, exist_ok=True)
+def build_waveform_figure(times, data, suggestions=None):
+    """Create the waveform figure, with the suggested reference clips drawn as green overlays."""
+    import plotly.graph_objs as go
 
-    times, data, framerate, n_channels, samp_width = read_audio_file(input_file)
-
-    # Create initial waveform figure
     fig = go.Figure(data=go.Scatter(x=times, y=data, mode='lines', line=dict(width=1)))
     fig.update_layout(
         title="Audio Waveform (Use Box/Lasso Select Tool)",
@@ -150,73 +182,198 @@ def create_dash_app(assets_dir, temp_dir, input_file, ffmpeg_path):
         selectdirection='h'
     )
 
-    app = dash.Dash(__name__)
+    for i, sug in enumerate(suggestions or []):
+        fig.add_shape(
+            type="rect",
+            xref="x",
+            yref="paper",
+            x0=sug['start'],
+            x1=sug['end'],
+            y0=0,
+            y1=1,
+            fillcolor="green",
+            opacity=0.15,
+            line_width=0
+        )
+        fig.add_annotation(
+            x=(sug['start'] + sug['end']) / 2,
+            y=1,
+            xref="x",
+            yref="paper",
+            text=f"#{i + 1}",
+            showarrow=False
+        )
+    return fig
+
+
+def build_spectrogram_figure(times, freqs, magnitudes_db, x_range=None):
+    """Create the spectrogram heatmap of the visible window, aligned with the waveform time axis."""
+    import plotly.graph_objs as go
+
+    fig = go.Figure(data=go.Heatmap(x=times, y=freqs, z=magnitudes_db, colorscale='Viridis', showscale=False,
+                                    zmin=float(np.percentile(magnitudes_db, 5)) if magnitudes_db.size else None))
+    fig.update_layout(
+        xaxis_title="Time (s)",
+        yaxis_title="Frequency (Hz)",
+        margin=dict(l=40, r=40, t=10, b=40),
+        height=250,
+    )
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
+    return fig
+
+
+def parse_relayout_range(relayout_data):
+    """Extract the visible x range from a graph relayoutData event, None for the full range."""
+    if not relayout_data or relayout_data.get('xaxis.autorange'):
+        return None
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'])
+    return None
+
+
+def create_dash_app(assets_dir, temp_dir, input_files, ffmpeg_path, workspace_max_age=6 * 3600, workspace_max_bytes=2 * 1024 ** 3):
+    """
+    Build the editor app. Several input files can be opened, every browser session works in
+    its own workspace below `temp_dir`, swept once idle for `workspace_max_age` seconds or
+    when all workspaces exceed `workspace_max_bytes`. Spectrogram cache entries are swept alike.
+    """
+    # dash is only needed once the server is built, not for `--help`
+    import dash
+    import diskcache
+    from dash import dcc, html, Input, Output, State, callback_context, no_update, dash_table, DiskcacheManager
+
+    os.makedirs(assets_dir, exist_ok=True)
+    os.makedirs(temp_dir, exist_ok=True)
+
+    # Preview/save jobs run in background processes, their state lives in a local disk cache
+    background_callback_manager = DiskcacheManager(diskcache.Cache(os.path.join(temp_dir, "jobs_cache")))
+
+    spectrogram_dir = os.path.join(temp_dir, "spectrograms")
+    workspaces = SessionWorkspaces(os.path.join(temp_dir, "sessions"), max_age=workspace_max_age, max_bytes=workspace_max_bytes,
+                                   cache_dirs=[spectrogram_dir])
+    workspaces.sweep()
+    workspaces.start_sweeper()
+
+    if isinstance(input_files, (str, Path)):
+        input_files = [input_files]
+    input_files = [str(f) for f in input_files]
+
+    times, data, framerate, n_channels, samp_width = load_audio(input_files[0])
+
+    # Spectrogram tiles are computed once per input file version and shared by every session
+    spectrograms = {}
+    spectrograms_lock = threading.Lock()
+
+    def get_spectrogram(file_path):
+        mtime = os.stat(file_path).st_mtime_ns
+        with spectrograms_lock:
+            # A file edited since drops its old tiles, its old cache entry is left to the sweeper
+            if file_path not in spectrograms or spectrograms[file_path][0] != mtime:
+                spectrograms[file_path] = (mtime, SpectrogramTiles(file_path, spectrogram_dir))
+        return spectrograms[file_path][1]
+
+    # Create initial waveform figure
+    fig = build_waveform_figure(times, data)
+
+    app = dash.Dash(__name__, background_callback_manager=background_callback_manager)
 
     columns = [
         {"name": "Type", "id": "type", "presentation": "dropdown", "editable": False},
         {"name": "Start (s)", "id": "start", "type": "numeric", "editable": True},
         {"name": "End (s)", "id": "end", "type": "numeric", "editable": True},
-        {"name": "Duration (s)", "id": "duration", "type": "numeric", "editable": False}
+        {"name": "Duration (s)", "id": "duration", "type": "numeric", "editable": False},
+        {"name": "Source", "id": "source", "editable": False}
     ]
 
     initial_data = []
 
-    app.layout = html.Div([
-        html.H1("Advanced Audio Editor"),
-        html.Div([
-            dcc.Graph(
-                id='waveform-graph',
-                figure=fig,
-                config={'modeBarButtonsToAdd': ['select2d', 'lasso2d'], 'displayModeBar': True},
-                style={'border': '1px solid #ccc'}
-            ),
-            html.Button("Add Selected Segment", id='add-selected-segment', n_clicks=0, style={'margin-top':'10px'}),
-        ], style={'width': '80%', 'margin': 'auto'}),
-
-        html.Div([
-            html.Label("Add Silence:"),
-            dcc.Input(id='silence-input', type='number', min=0, step=0.1, value=0, style={'margin-left':'10px', 'width':'100px'}),
-            html.Button("Add Silence", id='add-silence-button', n_clicks=0, style={'margin-left':'10px'}),
-        ], style={'width': '80%', 'margin': 'auto', 'margin-top':'20px'}),
-
-        html.Div([
-            dash_table.DataTable(
-                id='segments-table',
-                columns=columns,
-                data=initial_data,
-                editable=True,
-                row_deletable=False,
-                style_table={'overflowX': 'auto'},
-                style_cell={'textAlign': 'center'},
-                dropdown={
-                    'type': {
-                        'options': [
-                            {'label': 'segment', 'value': 'segment'},
-                            {'label': 'silence', 'value': 'silence'}
-                        ]
+    def serve_layout():
+        # Called on every page load: each browser tab gets its own session id
+        return html.Div([
+            html.H1("Advanced Audio Editor"),
+            html.Div([
+                dcc.Dropdown(
+                    id='input-select',
+                    options=[{'label': os.path.basename(f), 'value': f} for f in input_files],
+                    value=input_files[0],
+                    clearable=False,
+                    style={'margin-bottom': '10px'}
+                ),
+                dcc.Graph(
+                    id='waveform-graph',
+                    figure=fig,
+                    config={'modeBarButtonsToAdd': ['select2d', 'lasso2d'], 'displayModeBar': True},
+                    style={'border': '1px solid #ccc'}
+                ),
+                dcc.Graph(
+                    id='spectrogram-graph',
+                    config={'displayModeBar': False},
+                    style={'border': '1px solid #ccc', 'border-top': 'none'}
+                ),
+                html.Button("Add Selected Segment", id='add-selected-segment', n_clicks=0, style={'margin-top':'10px'}),
+            ], style={'width': '80%', 'margin': 'auto'}),
+
+            html.Div([
+                html.Label("Suggested clip length (s):"),
+                dcc.Input(id='suggestion-duration', type='number', min=1, step=0.5, value=6, style={'margin-left':'10px', 'width':'100px'}),
+                html.Button("Suggest Reference Clips", id='suggest-clips', n_clicks=0, style={'margin-left':'10px'}),
+                dcc.RadioItems(id='suggestion-choice', options=[], value=None, style={'margin-top':'10px'}),
+                html.Button("Add Suggested Clip", id='add-suggestion', n_clicks=0, style={'margin-top':'10px'}),
+            ], style={'width': '80%', 'margin': 'auto', 'margin-top':'20px'}),
+
+            html.Div([
+                html.Label("Add Silence:"),
+                dcc.Input(id='silence-input', type='number', min=0, step=0.1, value=0, style={'margin-left':'10px', 'width':'100px'}),
+                html.Button("Add Silence", id='add-silence-button', n_clicks=0, style={'margin-left':'10px'}),
+            ], style={'width': '80%', 'margin': 'auto', 'margin-top':'20px'}),
+
+            html.Div([
+                dash_table.DataTable(
+                    id='segments-table',
+                    columns=columns,
+                    data=initial_data,
+                    editable=True,
+                    row_deletable=False,
+                    style_table={'overflowX': 'auto'},
+                    style_cell={'textAlign': 'center'},
+                    dropdown={
+                        'type': {
+                            'options': [
+                                {'label': 'segment', 'value': 'segment'},
+                                {'label': 'silence', 'value': 'silence'}
+                            ]
+                        }
                     }
-                }
-            )
-        ], style={'width': '80%', 'margin': 'auto', 'margin-top': '20px'}),
-
-        html.Div([
-            html.Button("Move Up", id='move-up', n_clicks=0),
-            html.Button("Move Down", id='move-down', n_clicks=0, style={'margin-left':'10px'}),
-            html.Button("Delete Selected", id='delete-selected', n_clicks=0, style={'margin-left':'10px'}),
-            html.Button("Apply Edits", id='apply-edits', n_clicks=0, style={'margin-left':'10px', 'background-color':'#efefef'})
-        ], style={'width': '80%', 'margin': 'auto', 'margin-top': '10px'}),
-
-        html.Div([
-            html.Button("Generate Preview", id='generate-preview', n_clicks=0),
-            html.Button("Save Final Output", id='save-output', n_clicks=0, style={'margin-left':'10px'}),
-            html.Div(id='action-status', style={'margin-top': '10px'}),
-            html.Audio(id='audio-player', controls=True, src="", style={'margin-top':'20px', 'width':'80%'})
-        ], style={'width': '80%', 'margin': 'auto', 'margin-top': '20px'}),
-
-        dcc.Store(id='segments-data', data=initial_data),
-        dcc.Store(id='selected-row', data=None),
-        dcc.Store(id='graph-selection', data=None),
-    ])
+                )
+            ], style={'width': '80%', 'margin': 'auto', 'margin-top': '20px'}),
+
+            html.Div([
+                html.Button("Move Up", id='move-up', n_clicks=0),
+                html.Button("Move Down", id='move-down', n_clicks=0, style={'margin-left':'10px'}),
+                html.Button("Delete Selected", id='delete-selected', n_clicks=0, style={'margin-left':'10px'}),
+                html.Button("Apply Edits", id='apply-edits', n_clicks=0, style={'margin-left':'10px', 'background-color':'#efefef'})
+            ], style={'width': '80%', 'margin': 'auto', 'margin-top': '10px'}),
+
+            html.Div([
+                html.Button("Generate Preview", id='generate-preview', n_clicks=0),
+                html.Button("Save Final Output", id='save-output', n_clicks=0, style={'margin-left':'10px'}),
+                html.Button("Cancel", id='cancel-job', n_clicks=0, disabled=True, style={'margin-left':'10px'}),
+                html.Progress(id='job-progress', value='0', max='1', style={'margin-left':'10px', 'visibility':'hidden'}),
+                html.Div(id='action-status', style={'margin-top': '10px'}),
+                html.Audio(id='audio-player', controls=True, src="", style={'margin-top':'20px', 'width':'80%'})
+            ], style={'width': '80%', 'margin': 'auto', 'margin-top': '20px'}),
+
+            dcc.Store(id='segments-data', data=initial_data),
+            dcc.Store(id='selected-row', data=None),
+            dcc.Store(id='graph-selection', data=None),
+            dcc.Store(id='suggestions', data=[]),
+            dcc.Store(id='session-id', data=new_session_id()),
+        ])
+
+    app.layout = serve_layout
 
     @app.callback(
         Output('graph-selection', 'data'),
@@ -240,6 +397,44 @@ def create_dash_app(assets_dir, temp_dir, input_file, ffmpeg_path):
                         return {'start': start, 'end': end}
         return None
 
+    @app.callback(
+        Output('spectrogram-graph', 'figure'),
+        Input('waveform-graph', 'relayoutData'),
+        Input('input-select', 'value'),
+    )
+    def update_spectrogram(relayout_data, selected_input):
+        """Serve the spectrogram of the visible waveform window from the tile cache."""
+        x_range = parse_relayout_range(relayout_data)
+        if callback_context.triggered and callback_context.triggered[0]['prop_id'].startswith('input-select'):
+            x_range = None
+        spec_times, freqs, magnitudes_db = get_spectrogram(selected_input).get_window(*(x_range or (None, None)))
+        return build_spectrogram_figure(spec_times, freqs, magnitudes_db, x_range)
+
+    @app.callback(
+        Output('suggestions', 'data'),
+        Output('suggestion-choice', 'options'),
+        Output('suggestion-choice', 'value'),
+        Input('suggest-clips', 'n_clicks'),
+        Input('input-select', 'value'),
+        State('suggestion-duration', 'value'),
+        prevent_initial_call=True
+    )
+    def compute_suggestions(n_clicks, selected_input, target_duration):
+        """Analyze the selected input file and propose clean reference clips."""
+        if callback_context.triggered[0]['prop_id'].startswith('input-select'):
+            return [], [], None
+        target_duration = target_duration or 6
+        suggestions = suggest_reference_clips(selected_input,
+                                              ffmpeg_path=ffmpeg_path,
+                                              target_duration=target_duration,
+                                              max_duration=target_duration * 1.6)
+        options = [
+            {'label': f"#{i + 1}: {sug['start']:.2f}s - {sug['end']:.2f}s ({sug['duration']:.2f}s, SNR {sug['snr_db']} dB)",
+             'value': i}
+            for i, sug in enumerate(suggestions)
+        ]
+        return suggestions, options, (0 if suggestions else None)
+
     @app.callback(
         Output('segments-data', 'data'),
         Input('add-selected-segment', 'n_clicks'),
@@ -248,15 +443,20 @@ def create_dash_app(assets_dir, temp_dir, input_file, ffmpeg_path):
         Input('move-down', 'n_clicks'),
         Input('delete-selected', 'n_clicks'),
         Input('apply-edits', 'n_clicks'),
+        Input('add-suggestion', 'n_clicks'),
         State('graph-selection', 'data'),
         State('silence-input', 'value'),
         State('segments-data', 'data'),
         State('selected-row', 'data'),
         State('segments-table', 'data'),
+        State('suggestions', 'data'),
+        State('suggestion-choice', 'value'),
+        State('input-select', 'value'),
         prevent_initial_call=True
     )
     def modify_segments_data(add_seg_click, add_sil_click, move_up_click, move_down_click, delete_click,
-                            apply_edits_click, selection, silence_val, segments, selected_row, table_data):
+                            apply_edits_click, add_sug_click, selection, silence_val, segments, selected_row, table_data,
+                            suggestions, suggestion_choice, selected_input):
         """Single callback that updates segments-data from buttons or from applied edits."""
         ctx = callback_context
         if not ctx.triggered:
@@ -281,7 +481,18 @@ def create_dash_app(assets_dir, temp_dir, input_file, ffmpeg_path):
                     'type': 'segment',
                     'start': round(selection['start'], 2),
                     'end': round(selection['end'], 2),
-                    'duration': round(selection['end'] - selection['start'], 2)
+                    'duration': round(selection['end'] - selection['start'], 2),
+                    'source': selected_input
+                })
+
+            elif trigger_id == 'add-suggestion' and suggestions and suggestion_choice is not None:
+                sug = suggestions[suggestion_choice]
+                updated_segments.append({
+                    'type': 'segment',
+                    'start': sug['start'],
+                    'end': sug['end'],
+                    'duration': sug['duration'],
+                    'source': selected_input
                 })
 
             elif trigger_id == 'add-silence-button' and silence_val is not None and silence_val > 0:
@@ -328,20 +539,39 @@ def create_dash_app(assets_dir, temp_dir, input_file, ffmpeg_path):
         Input('generate-preview', 'n_clicks'),
         Input('save-output', 'n_clicks'),
         State('segments-data', 'data'),
+        State('session-id', 'data'),
+        background=True,
+        running=[
+            (Output('generate-preview', 'disabled'), True, False),
+            (Output('save-output', 'disabled'), True, False),
+            (Output('cancel-job', 'disabled'), False, True),
+            (Output('job-progress', 'style'), {'margin-left':'10px', 'visibility':'visible'}, {'margin-left':'10px', 'visibility':'hidden'}),
+        ],
+        progress=[Output('job-progress', 'value'), Output('job-progress', 'max')],
+        # A job rendering an outdated segment list is useless, drop it as soon as the list changes
+        cancel=[Input('segments-data', 'data'), Input('cancel-job', 'n_clicks')],
         prevent_initial_call=True
     )
-    def handle_preview_save(preview_click, save_click, segments):
-        """Handle generating a preview or saving the final output."""
+    def handle_preview_save(set_progress, preview_click, save_click, segments, session_id):
+        """Handle generating a preview or saving the final output in a background job."""
         ctx = callback_context
         if not ctx.triggered:
             return no_update, no_update
         button_id = ctx.triggered[0]['prop_id'].split('.')[0]
 
+        # The output format follows the source of the first cut segment
+        sources = [seg.get('source') for seg in segments or [] if seg['type'] == 'segment' and seg.get('source')]
+        out_framerate, out_channels = read_wav_format(sources[0] if sources else input_files[0])
+        final_preview = os.path.join(workspaces.get(session_id), "preview.wav")
+
         if button_id == 'generate-preview':
             if not segments:
                 return "No segments to preview.", no_update
             
-            final_preview = generate_preview(segments, framerate, n_channels, temp_dir, input_file, ffmpeg_path)
+            with workspaces.job_dir(session_id) as job_dir:
+                generate_preview(segments, out_framerate, out_channels, job_dir, input_files[0], ffmpeg_path,
+                                 progress_callback=lambda done, total: set_progress((str(done), str(total))),
+                                 output_file=final_preview)
             data_uri = file_to_data_uri(final_preview)
             return "Preview generated.", data_uri
 
@@ -349,9 +579,15 @@ def create_dash_app(assets_dir, temp_dir, input_file, ffmpeg_path):
             if not segments:
                 return "No segments to save.", no_update
             
-            final_preview = generate_preview(segments, framerate, n_channels, temp_dir, input_file, ffmpeg_path)
-            final_file = os.path.join(assets_dir, "final_output.wav")
-            normalize_audio(final_preview, final_file, target_db=-20)
+            total_steps = len(segments) + 3
+            with workspaces.job_dir(session_id) as job_dir:
+                generate_preview(segments, out_framerate, out_channels, job_dir, input_files[0], ffmpeg_path,
+                                 progress_callback=lambda done, total: set_progress((str(done), str(total_steps))),
+                                 output_file=final_preview)
+            final_file = os.path.join(assets_dir, f"final_output_{session_id[:8]}.wav")
+            with atomic_output(final_file) as tmp_file:
+                normalize_audio(final_preview, tmp_file, target_db=-20, ffmpeg_path=ffmpeg_path)
+            set_progress((str(total_steps), str(total_steps)))
 
             data_uri = file_to_data_uri(final_preview)
             return f"Final output saved as {os.path.basename(final_file)}.", data_uri
@@ -359,25 +595,20 @@ def create_dash_app(assets_dir, temp_dir, input_file, ffmpeg_path):
     @app.callback(
         Output('waveform-graph', 'figure'),
         Input('selected-row', 'data'),
+        Input('suggestions', 'data'),
+        Input('input-select', 'value'),
         State('segments-data', 'data'),
         prevent_initial_call=True
     )
-    def highlight_selected_segment(selected_row, segments):
-        """Highlight the selected segment on the waveform graph."""
-        new_fig = go.Figure(data=go.Scatter(x=times, y=data, mode='lines', line=dict(width=1)))
-        new_fig.update_layout(
-            title="Audio Waveform (Use Box/Lasso Select Tool)",
-            xaxis_title="Time (s)",
-            yaxis_title="Amplitude",
-            margin=dict(l=40, r=40, t=40, b=40),
-            height=300,
-            dragmode='select',
-            selectdirection='h'
-        )
+    def highlight_selected_segment(selected_row, suggestions, selected_input, segments):
+        """Highlight the selected segment and the suggested clips on the waveform of the selected input."""
+        times, data, *_ = load_audio(selected_input)
+        new_fig = build_waveform_figure(times, data, suggestions)
 
         if selected_row is not None and 0 <= selected_row < len(segments):
             seg = segments[selected_row]
-            if seg['type'] == 'segment' and seg['start'] is not None and seg['end'] is not None:
+            if (seg['type'] == 'segment' and seg['start'] is not None and seg['end'] is not None
+                    and seg.get('source', selected_input) == selected_input):
                 new_fig.add_shape(
                     type="rect",
                     xref="x",
@@ -405,8 +636,9 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument(
         '--input-file',
         type=str,
+        nargs='+',
         required=True,
-        help="Path to the input audio file (e.g., .wav, .m4a)."
+        help="Path to the input .wav file(s), several files can be opened in the same editor."
     )
 
     parser.add_argument(
@@ -430,6 +662,20 @@ def parse_arguments() -> argparse.Namespace:
         help="Directory to store temporary files."
     )
 
+    parser.add_argument(
+        '--workspace-max-age',
+        type=float,
+        default=6.0,
+        help="Hours after which an idle session workspace is deleted."
+    )
+
+    parser.add_argument(
+        '--workspace-max-mb',
+        type=float,
+        default=2048,
+        help="Maximum total size in MB of the session workspaces."
+    )
+
     parser.add_argument(
         '--host',
         type=str,
@@ -461,7 +707,9 @@ if __name__ == '__main__':
 
     app = create_dash_app(assets_dir=args.assets_dir,
                           temp_dir=args.temp_dir,
-                          input_file=args.input_file,
+                          input_files=args.input_file,
                           ffmpeg_path=args.ffmpeg_path,
+                          workspace_max_age=args.workspace_max_age * 3600,
+                          workspace_max_bytes=int(args.workspace_max_mb * 1024 ** 2),
                           )
     app.run(host=args.host, port=args.port, debug=bool(args.debug))
@@ -0,0 +1,192 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from loguru import logger
+
+
+# Entry points run as `python -m <module> --help` from the repository root
+ENTRY_POINTS = [
+    "shared_utils.audio_app_selection",
+    "shared_utils.download_audio",
+    "shared_utils.extract_wav_segment",
+    "shared_utils.ingest_voices",
+    "shared_utils.normalize_dir",
+    "shared_utils.resource_plan",
+    "shared_utils.voice_activity",
+    "models.F5-TTS.src.main",
+    "models.F5-TTS.src.infer_all",
+    "models.F5-TTS.src.bench_chunking",
+    "models.F5-TTS.src.sweep",
+    "models.F5-TTS.src.rerender",
+    "models.F5-TTS.src.jobs",
+    "models.F5-TTS.src.calibrate_voices",
+    "models.F5-TTS.src.bench_merge",
+    "models.F5-TTS.src.extract_chunks",
+]
+
+
+def parse_importtime(stderr):
+    """
+    Parse `python -X importtime` output.
+
+    Returns:
+        tuple: (total import time in ms, list of (cumulative ms, module) of the top-level imports)
+    """
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name[1:]
+        if name.startswith(" "):
+            continue  # nested import, already counted in its parent
+        top_level.append((int(cumulative_us) / 1000.0, name.strip()))
+    return sum(ms for ms, _ in top_level), top_level
+
+
+def measure_entry_point(module, runs=3, python=sys.executable, cwd=None):
+    """
+    Measure the import time of `python -m <module> --help`, keeping the median of `runs` runs.
+
+    Returns:
+        dict: 'import_ms' (median total), 'heaviest' (top 5 top-level imports of the median run)
+        and 'returncode' of the last run.
+    """
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run([python, "-X", "importtime", "-m", module, "--help"],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=cwd)
+        total_ms, top_level = parse_importtime(result.stderr)
+        samples.append((total_ms, top_level, result.returncode))
+
+    samples.sort(key=lambda s: s[0])
+    total_ms, top_level, returncode = samples[len(samples) // 2]
+    heaviest = sorted(top_level, reverse=True)[:5]
+    return {
+        'import_ms': round(total_ms, 1),
+        'heaviest': [[round(ms, 1), name] for ms, name in heaviest],
+        'returncode': returncode,
+    }
+
+
+def check_regressions(measures, baseline, tolerance, slack_ms, max_ms):
+    """Return the list of human-readable regressions of `measures` against the baseline and the absolute budget."""
+    regressions = []
+    for module, measure in measures.items():
+        if measure['returncode'] != 0:
+            regressions.append(f"{module}: '--help' exited with code {measure['returncode']}")
+        if max_ms is not None and measure['import_ms'] > max_ms:
+            regressions.append(f"{module}: {measure['import_ms']} ms exceeds the {max_ms} ms budget")
+        if module in baseline:
+            allowed = baseline[module]['import_ms'] * (1.0 + tolerance) + slack_ms
+            if measure['import_ms'] > allowed:
+                regressions.append(f"{module}: {measure['import_ms']} ms vs baseline "
+                                   f"{baseline[module]['import_ms']} ms (allowed {allowed:.1f} ms)")
+    return regressions
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="Measure the startup import time of every CLI entry point and fail on regressions.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--baseline',
+        type=Path,
+        default=Path("data/startup_times.json"),
+        help="JSON file holding the reference import times."
+    )
+
+    parser.add_argument(
+        '--record',
+        action='store_true',
+        help="Write the current measures as the new baseline instead of checking them."
+    )
+
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.25,
+        help="Allowed relative regression against the baseline."
+    )
+
+    parser.add_argument(
+        '--slack-ms',
+        type=float,
+        default=20.0,
+        help="Allowed absolute regression in ms on top of the relative tolerance."
+    )
+
+    parser.add_argument(
+        '--max-ms',
+        type=float,
+        default=None,
+        help="Absolute import time budget in ms for every entry point."
+    )
+
+    parser.add_argument(
+        '--runs',
+        type=int,
+        default=3,
+        help="Number of runs per entry point (the median is kept)."
+    )
+
+    parser.add_argument(
+        '--entry-points',
+        type=str,
+        nargs='*',
+        default=ENTRY_POINTS,
+        help="Modules to measure."
+    )
+
+    return parser.parse_args()
+
+
+def main(baseline_path, record, tolerance, slack_ms, max_ms, runs, entry_points):
+
+    measures = {}
+    for module in entry_points:
+        measures[module] = measure_entry_point(module, runs=runs)
+        heaviest = ", ".join(f"{name} {ms} ms" for ms, name in measures[module]['heaviest'][:3])
+        logger.info(f"{module}: {measures[module]['import_ms']} ms ({heaviest})")
+
+    if record:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(measures, f, indent=2)
+        logger.success(f"Startup baseline recorded in {baseline_path}")
+        return 0
+
+    baseline = {}
+    if baseline_path.is_file():
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    else:
+        logger.warning(f"No baseline found at {baseline_path}, only the absolute budget is checked.")
+
+    regressions = check_regressions(measures, baseline, tolerance, slack_ms, max_ms)
+    for regression in regressions:
+        logger.error(regression)
+    if regressions:
+        return 1
+    logger.success("No startup time regression.")
+    return 0
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    logger.debug(f"Received arguments: {args}")
+
+    sys.exit(main(baseline_path=args.baseline,
+                  record=args.record,
+                  tolerance=args.tolerance,
+                  slack_ms=args.slack_ms,
+                  max_ms=args.max_ms,
+                  runs=args.runs,
+                  entry_points=args.entry_points,
+                  ))
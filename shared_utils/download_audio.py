@@ -1,21 +1,50 @@
 import os
 import argparse
 from loguru import logger
-from pytubefix import YouTube 
-from pytubefix.cli import on_progress
 
+from .utils_audio import decode_to_wav
 
-def main(url: str, save_path: str):
+
+def download_youtube_audio(url, save_path, name="output", ffmpeg_path='ffmpeg', show_progress=True):
+    """
+    Download the audio stream of a YouTube video and decode it to a PCM WAV file.
+
+    The stream is stored under its real container extension (m4a, webm...) and then
+    decoded, so the resulting '.wav' file really contains PCM samples.
+
+    Parameters:
+        url (str): URL of the YouTube video.
+        save_path (str or Path): Directory where the files are saved.
+        name (str): Base name (without extension) of the saved files.
+        ffmpeg_path (str): Path to the ffmpeg executable. Defaults to 'ffmpeg' if in PATH.
+        show_progress (bool): Display the pytubefix progress bar.
+
+    Returns:
+        str: Path to the decoded .wav file.
+    """
+    from pytubefix import YouTube
+    from pytubefix.cli import on_progress
 
     os.makedirs(save_path, exist_ok=True)
 
-    yt = YouTube(url, on_progress_callback=on_progress)
+    yt = YouTube(url, on_progress_callback=on_progress if show_progress else None)
     logger.info(f"Fetching video details for URL: {url}")
     logger.info(f"Video Title: {yt.title}")
 
     ys = yt.streams.get_audio_only()
-    ys.download(output_path=save_path, filename="output.wav")
-    logger.success(f"Download completed successfully. File saved at '{os.path.join(save_path, 'output.wav')}'")
+    extension = "m4a" if ys.subtype == "mp4" else ys.subtype
+    stream_file = ys.download(output_path=str(save_path), filename=f"{name}.{extension}")
+    logger.info(f"Audio stream saved at '{stream_file}'")
+
+    wav_file = os.path.join(save_path, f"{name}.wav")
+    decode_to_wav(stream_file, wav_file, ffmpeg_path=ffmpeg_path)
+    return wav_file
+
+
+def main(url: str, save_path: str, ffmpeg_path: str = 'ffmpeg'):
+
+    wav_file = download_youtube_audio(url, save_path, ffmpeg_path=ffmpeg_path)
+    logger.success(f"Download completed successfully. File saved at '{wav_file}'")
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -39,6 +68,13 @@ def parse_arguments() -> argparse.Namespace:
         help="Directory where the audio file will be saved."
     )
 
+    parser.add_argument(
+        '--ffmpeg-path',
+        type=str,
+        default='ffmpeg',
+        help="Path to the ffmpeg executable. Defaults to 'ffmpeg' if in PATH."
+    )
+
     return parser.parse_args()
 
 
@@ -47,4 +83,4 @@ if __name__ == "__main__":
     args = parse_arguments()
     logger.debug(f"Received arguments: {args}")
 
-    main(url=args.url, save_path=args.save_path)
+    main(url=args.url, save_path=args.save_path, ffmpeg_path=args.ffmpeg_path)
@@ -0,0 +1,126 @@
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from loguru import logger
+
+from .resource_plan import plan_resources
+
+
+@dataclass
+class FFmpegJobResult:
+    """Outcome of one ffmpeg job run through an `FFmpegJobPool`."""
+    job_id: int
+    cmd: list
+    status: str  # "ok", "failed", "timeout" or "cancelled"
+    returncode: int = None
+    stdout: str = ""
+    stderr: str = ""
+    elapsed: float = 0.0
+    meta: dict = field(default_factory=dict)
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+
+class FFmpegJobPool:
+    """
+    Run ffmpeg commands as asyncio subprocesses with at most `max_jobs` of them alive at once.
+
+    Jobs never raise on ffmpeg errors: every job resolves to an `FFmpegJobResult` whose status
+    tells whether it succeeded, failed, timed out or was cancelled. A job that times out or
+    is cancelled has its ffmpeg process killed.
+
+    Parameters:
+        max_jobs (int): Maximum number of concurrent ffmpeg processes. From the resource plan (CPUs and memory available) if None.
+        timeout (float): Default per-job timeout in seconds. No timeout if None.
+    """
+
+    def __init__(self, max_jobs=None, timeout=None):
+        self.max_jobs = max_jobs or plan_resources("ffmpeg").workers
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(self.max_jobs)
+        self._tasks = set()
+        self._job_ids = itertools.count()
+
+    async def run(self, ffmpeg_cmd, timeout=None, meta=None):
+        """
+        Run one ffmpeg command once a slot is free and wait for its result.
+
+        Parameters:
+            ffmpeg_cmd (list[str]): The ffmpeg command and arguments as a list.
+            timeout (float): Timeout in seconds for this job, overriding the pool default.
+            meta (dict): Free-form data attached to the result (e.g. the file being processed).
+
+        Returns:
+            FFmpegJobResult: The structured result of the job.
+        """
+        job_id = next(self._job_ids)
+        timeout = self.timeout if timeout is None else timeout
+        result = FFmpegJobResult(job_id=job_id, cmd=list(ffmpeg_cmd), status="cancelled", meta=meta or {})
+
+        async with self._semaphore:
+            logger.debug(f"[job {job_id}] Running command: {' '.join(ffmpeg_cmd)}")
+            start = time.perf_counter()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *ffmpeg_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+            except OSError as e:
+                result.status = "failed"
+                result.stderr = str(e)
+                logger.error(f"[job {job_id}] Could not start ffmpeg: {e}")
+                return result
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.TimeoutError:
+                await self._kill(proc)
+                result.status = "timeout"
+                result.elapsed = time.perf_counter() - start
+                logger.error(f"[job {job_id}] ffmpeg command timed out after {timeout}s")
+                return result
+            except asyncio.CancelledError:
+                await self._kill(proc)
+                result.elapsed = time.perf_counter() - start
+                logger.warning(f"[job {job_id}] ffmpeg command cancelled")
+                raise
+
+        result.elapsed = time.perf_counter() - start
+        result.returncode = proc.returncode
+        result.stdout = stdout.decode(errors="replace")
+        result.stderr = stderr.decode(errors="replace")
+        if proc.returncode != 0:
+            result.status = "failed"
+            logger.error(f"[job {job_id}] ffmpeg command failed with error:\n{result.stderr}")
+        else:
+            result.status = "ok"
+            logger.debug(f"[job {job_id}] ffmpeg command completed successfully in {result.elapsed:.2f}s.")
+        return result
+
+    def submit(self, ffmpeg_cmd, timeout=None, meta=None):
+        """Schedule a job without waiting for it. Returns the asyncio task, which `cancel_all` can cancel."""
+        task = asyncio.ensure_future(self.run(ffmpeg_cmd, timeout=timeout, meta=meta))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def map(self, ffmpeg_cmds, timeout=None):
+        """Run several commands concurrently and return their results in order (cancelled jobs included)."""
+        tasks = [self.submit(cmd, timeout=timeout) for cmd in ffmpeg_cmds]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return [
+            FFmpegJobResult(job_id=-1, cmd=list(cmd), status="cancelled") if isinstance(res, asyncio.CancelledError) else res
+            for cmd, res in zip(ffmpeg_cmds, results)
+        ]
+
+    def cancel_all(self):
+        """Cancel every job submitted and not finished yet, killing the running ffmpeg processes."""
+        for task in list(self._tasks):
+            task.cancel()
+
+    @staticmethod
+    async def _kill(proc):
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
@@ -0,0 +1,305 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlparse
+from loguru import logger
+
+from .resource_plan import plan_resources
+from .utils_audio import decode_to_wav, normalize_audio
+
+
+YOUTUBE_HOSTS = ("youtube.com", "www.youtube.com", "m.youtube.com", "youtu.be", "music.youtube.com")
+
+
+def _source_id(source):
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+
+
+def fetch_local(source, download_dir):
+    """Local files are used in place, nothing is copied."""
+    path = Path(source[len("file://"):] if source.startswith("file://") else source)
+    if not path.is_file():
+        raise FileNotFoundError(f"Input file not found: {path}")
+    return path
+
+
+def fetch_http(source, download_dir):
+    """Stream a remote audio file to the download directory."""
+    name = Path(urlparse(source).path).name or "download"
+    out_file = Path(download_dir) / f"{_source_id(source)}_{name}"
+    with urllib.request.urlopen(source) as response, open(out_file, 'wb') as f:
+        shutil.copyfileobj(response, f)
+    logger.debug(f"Downloaded {source} to {out_file}")
+    return out_file
+
+
+def fetch_youtube(source, download_dir):
+    """Download the audio stream of a YouTube video (pytubefix is only imported when needed)."""
+    from .download_audio import download_youtube_audio
+    return Path(download_youtube_audio(source, download_dir, name=_source_id(source), show_progress=False))
+
+
+FETCHERS = {
+    "local": fetch_local,
+    "http": fetch_http,
+    "youtube": fetch_youtube,
+}
+
+
+def register_fetcher(kind, fetcher):
+    """
+    Register (or replace) the fetcher used for a kind of source.
+
+    Parameters:
+        kind (str): One of the kinds returned by `source_kind` ('local', 'http', 'youtube').
+        fetcher (callable): `fetcher(source, download_dir) -> Path` returning a local audio file.
+    """
+    FETCHERS[kind] = fetcher
+
+
+def source_kind(source):
+    """Classify a source string as 'youtube', 'http' or 'local'."""
+    parsed = urlparse(str(source))
+    if parsed.scheme in ("http", "https"):
+        if parsed.hostname in YOUTUBE_HOSTS:
+            return "youtube"
+        return "http"
+    return "local"
+
+
+def load_manifest(manifest_path):
+    """
+    Load an ingest manifest: a JSON list of entries such as
+    {"voice": "narrator", "source": "<path or url>", "start": 12.0, "duration": 8.0, "text": "..."}.
+    'start', 'duration' and 'text' are optional, 'text_file' may replace 'text'.
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    voices = set()
+    for entry in entries:
+        if not entry.get("voice") or not entry.get("source"):
+            raise ValueError(f"Manifest entries need a 'voice' and a 'source': {entry}")
+        if entry["voice"] in voices:
+            raise ValueError(f"Voice '{entry['voice']}' is defined twice in {manifest_path}")
+        voices.add(entry["voice"])
+        if entry.get("text_file"):
+            with open(entry["text_file"], "r", encoding="utf-8") as f:
+                entry["text"] = f.read()
+    return entries
+
+
+async def _ingest_entry(entry, fetch_source, stage_limits, work_dir, output_dir, sample_rate, channels, target_db, ffmpeg_path):
+    voice = entry["voice"]
+
+    source_file = await fetch_source(entry["source"])
+
+    cut_file = Path(work_dir) / f"{voice}_cut.wav"
+    async with stage_limits["decode"]:
+        await asyncio.to_thread(
+            decode_to_wav, source_file, cut_file,
+            start_time=entry.get("start"), duration=entry.get("duration"),
+            sample_rate=sample_rate, channels=channels, ffmpeg_path=ffmpeg_path,
+        )
+
+    wav_file = Path(output_dir) / f"{voice}.wav"
+    async with stage_limits["normalize"]:
+        normalized = await asyncio.to_thread(normalize_audio, cut_file, wav_file, target_db, ffmpeg_path=ffmpeg_path)
+    if not normalized:
+        # normalize_audio skips silent inputs, keep the decoded cut as is (replacing a previous ingestion)
+        shutil.copyfile(cut_file, wav_file)
+    cut_file.unlink(missing_ok=True)
+
+    txt_file = Path(output_dir) / f"{voice}.txt"
+    with open(txt_file, "w", encoding="utf-8") as f:
+        f.write(entry.get("text", "").strip())
+
+    logger.info(f"Voice '{voice}' ready: {wav_file}")
+    return wav_file
+
+
+async def ingest_voices(entries, output_dir, work_dir, fetch_jobs=4, decode_jobs=None, normalize_jobs=None,
+                        sample_rate=24000, channels=1, target_db=-20.0, ffmpeg_path='ffmpeg', fetcher=None):
+    """
+    Turn a list of manifest entries into '<voice>.wav' / '<voice>.txt' reference pairs.
+
+    Sources are fetched, decoded/cut and normalized concurrently, each stage with its own
+    concurrency bound. A source shared by several voices is only fetched once.
+
+    Parameters:
+        entries (list[dict]): Manifest entries (see `load_manifest`).
+        output_dir (str or Path): Directory receiving the reference pairs.
+        work_dir (str or Path): Directory for downloads and intermediate files.
+        fetch_jobs (int): Maximum number of concurrent fetches.
+        decode_jobs (int): Maximum number of concurrent decode/cut ffmpeg jobs. From the resource plan if None.
+        normalize_jobs (int): Maximum number of concurrent normalization jobs. From the resource plan if None.
+        sample_rate (int): Sample rate of the reference clips.
+        channels (int): Channel count of the reference clips.
+        target_db (float): Target mean volume in dB.
+        ffmpeg_path (str): Path to the ffmpeg executable. Defaults to 'ffmpeg' if in PATH.
+        fetcher (callable): Optional `fetcher(source, download_dir) -> Path` used for every source
+            instead of the registered ones.
+
+    Returns:
+        dict: voice name -> Path of the written .wav file, or the exception that made it fail.
+    """
+    ffmpeg_jobs = plan_resources("ffmpeg").log().workers
+    stage_limits = {
+        "fetch": asyncio.Semaphore(fetch_jobs),
+        "decode": asyncio.Semaphore(decode_jobs or ffmpeg_jobs),
+        "normalize": asyncio.Semaphore(normalize_jobs or ffmpeg_jobs),
+    }
+
+    output_dir, work_dir = Path(output_dir), Path(work_dir)
+    download_dir = work_dir / "downloads"
+    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(download_dir, exist_ok=True)
+
+    fetch_tasks = {}
+
+    async def _fetch(source):
+        async with stage_limits["fetch"]:
+            fetch_fn = fetcher or FETCHERS[source_kind(source)]
+            logger.info(f"Fetching '{source}'")
+            return await asyncio.to_thread(fetch_fn, source, download_dir)
+
+    def fetch_source(source):
+        if source not in fetch_tasks:
+            fetch_tasks[source] = asyncio.ensure_future(_fetch(source))
+        return fetch_tasks[source]
+
+    results = await asyncio.gather(
+        *[_ingest_entry(entry, fetch_source, stage_limits, work_dir, output_dir,
+                        sample_rate, channels, target_db, ffmpeg_path) for entry in entries],
+        return_exceptions=True,
+    )
+
+    outputs = {}
+    for entry, result in zip(entries, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Ingest of voice '{entry['voice']}' failed: {result}")
+        outputs[entry["voice"]] = result
+    return outputs
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="Fetch, decode, cut and normalize source recordings into reference voices.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--manifest',
+        type=Path,
+        required=True,
+        help="JSON list of {voice, source, start, duration, text | text_file} entries."
+    )
+
+    parser.add_argument(
+        '--output-dir',
+        type=Path,
+        default="data/ref",
+        help="Directory where the '<voice>.wav' / '<voice>.txt' pairs are written."
+    )
+
+    parser.add_argument(
+        '--work-dir',
+        type=Path,
+        default="data/temp/ingest",
+        help="Directory for downloads and intermediate files."
+    )
+
+    parser.add_argument(
+        '--fetch-jobs',
+        type=int,
+        default=4,
+        help="Maximum number of concurrent downloads."
+    )
+
+    parser.add_argument(
+        '--decode-jobs',
+        type=int,
+        default=None,
+        help="Maximum number of concurrent decode/cut jobs. Defaults to the CPUs available (affinity and cgroup quota)."
+    )
+
+    parser.add_argument(
+        '--normalize-jobs',
+        type=int,
+        default=None,
+        help="Maximum number of concurrent normalization jobs. Defaults to the CPUs available (affinity and cgroup quota)."
+    )
+
+    parser.add_argument(
+        '--sample-rate',
+        type=int,
+        default=24000,
+        help="Sample rate of the reference clips."
+    )
+
+    parser.add_argument(
+        '--channels',
+        type=int,
+        default=1,
+        help="Channel count of the reference clips."
+    )
+
+    parser.add_argument(
+        '--target-db',
+        type=float,
+        default=-20.0,
+        help="Target dB level for audio normalization."
+    )
+
+    parser.add_argument(
+        '--ffmpeg-path',
+        type=str,
+        default='ffmpeg',
+        help="Path to the ffmpeg executable. Defaults to 'ffmpeg' if in PATH."
+    )
+
+    return parser.parse_args()
+
+
+def main(manifest, output_dir, work_dir, fetch_jobs, decode_jobs, normalize_jobs, sample_rate, channels, target_db, ffmpeg_path='ffmpeg'):
+
+    entries = load_manifest(manifest)
+    logger.info(f"Ingesting {len(entries)} voices from '{manifest}'")
+
+    start = time.perf_counter()
+    outputs = asyncio.run(ingest_voices(
+        entries, output_dir, work_dir,
+        fetch_jobs=fetch_jobs, decode_jobs=decode_jobs, normalize_jobs=normalize_jobs,
+        sample_rate=sample_rate, channels=channels, target_db=target_db, ffmpeg_path=ffmpeg_path,
+    ))
+    elapsed = time.perf_counter() - start
+
+    failed = [voice for voice, result in outputs.items() if isinstance(result, BaseException)]
+    if failed:
+        raise RuntimeError(f"Ingest failed for voices: {', '.join(failed)}")
+    logger.success(f"{len(outputs)} voices written to '{output_dir}' in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    logger.debug(f"Received arguments: {args}")
+
+    main(manifest=args.manifest,
+         output_dir=args.output_dir,
+         work_dir=args.work_dir,
+         fetch_jobs=args.fetch_jobs,
+         decode_jobs=args.decode_jobs,
+         normalize_jobs=args.normalize_jobs,
+         sample_rate=args.sample_rate,
+         channels=args.channels,
+         target_db=args.target_db,
+         ffmpeg_path=args.ffmpeg_path,
+        )
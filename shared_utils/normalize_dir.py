@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+from loguru import logger
+
+from .ffmpeg_pool import FFmpegJobPool, FFmpegJobResult
+from .utils_audio import build_volumedetect_command, parse_mean_volume, build_gain_command, normalize_audio
+
+
+async def normalize_audio_async(pool, input_file, output_file, target_db, ffmpeg_path='ffmpeg', timeout=None):
+    """
+    Async counterpart of `utils_audio.normalize_audio` running both ffmpeg passes through `pool`.
+
+    Returns:
+        FFmpegJobResult: Result of the last job run, with the input file in `meta['input_file']`.
+    """
+    meta = {'input_file': str(input_file), 'output_file': str(output_file)}
+
+    detect = await pool.run(build_volumedetect_command(input_file, ffmpeg_path=ffmpeg_path), timeout=timeout, meta=meta)
+    if not detect.ok:
+        return detect
+
+    mean_volume = parse_mean_volume(detect.stderr)
+    if mean_volume is None:
+        logger.warning(f"No mean volume detected in {input_file}; skipping normalization.")
+        detect.status = "failed"
+        return detect
+
+    diff_db = target_db - mean_volume
+    os.makedirs(Path(output_file).parent, exist_ok=True)
+    result = await pool.run(build_gain_command(input_file, output_file, diff_db, ffmpeg_path=ffmpeg_path), timeout=timeout, meta=meta)
+    result.elapsed += detect.elapsed
+    result.meta['diff_db'] = diff_db
+    return result
+
+
+def list_audio_files(input_dir, pattern="*.wav"):
+    """Recursively list the files of `input_dir` matching `pattern`, sorted."""
+    return sorted(p for p in Path(input_dir).rglob(pattern) if p.is_file())
+
+
+async def normalize_directory(input_files, input_dir, output_dir, target_db, max_jobs=None, timeout=None, ffmpeg_path='ffmpeg'):
+    """
+    Normalize every file to `target_db` with at most `max_jobs` ffmpeg processes at once.
+    The directory layout below `input_dir` is reproduced in `output_dir`.
+
+    Returns:
+        list[FFmpegJobResult]: One result per input file, in order.
+    """
+    pool = FFmpegJobPool(max_jobs=max_jobs, timeout=timeout)
+    jobs = [
+        normalize_audio_async(pool, f, Path(output_dir) / Path(f).relative_to(input_dir), target_db,
+                              ffmpeg_path=ffmpeg_path)
+        for f in input_files
+    ]
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+    return [
+        FFmpegJobResult(job_id=-1, cmd=[], status="cancelled", meta={'input_file': str(f)})
+        if isinstance(res, asyncio.CancelledError) else res
+        for f, res in zip(input_files, results)
+    ]
+
+
+def normalize_directory_sequential(input_files, input_dir, output_dir, target_db, ffmpeg_path='ffmpeg'):
+    """Reference path: normalize the files one after another with `utils_audio.normalize_audio`."""
+    for f in input_files:
+        output_file = Path(output_dir) / Path(f).relative_to(input_dir)
+        os.makedirs(output_file.parent, exist_ok=True)
+        normalize_audio(f, output_file, target_db, ffmpeg_path=ffmpeg_path)
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="Normalize every recording of a directory to a target mean volume, in parallel.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--input-dir',
+        type=Path,
+        required=True,
+        help="Directory containing the recordings to normalize (searched recursively)."
+    )
+
+    parser.add_argument(
+        '--output-dir',
+        type=Path,
+        required=True,
+        help="Directory where the normalized recordings are written, keeping the input layout."
+    )
+
+    parser.add_argument(
+        '--pattern',
+        type=str,
+        default="*.wav",
+        help="Glob pattern of the files to normalize."
+    )
+
+    parser.add_argument(
+        '--target-db',
+        type=float,
+        default=-20.0,
+        help="Target dB level for audio normalization."
+    )
+
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help="Maximum number of concurrent ffmpeg processes. Defaults to the CPUs available (affinity and cgroup quota)."
+    )
+
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        help="Timeout in seconds of each ffmpeg job."
+    )
+
+    parser.add_argument(
+        '--compare-sequential',
+        action='store_true',
+        help="Also run the sequential path (into a temporary directory) and report the speedup."
+    )
+
+    parser.add_argument(
+        '--ffmpeg-path',
+        type=str,
+        default='ffmpeg',
+        help="Path to the ffmpeg executable. Defaults to 'ffmpeg' if in PATH."
+    )
+
+    return parser.parse_args()
+
+
+def main(input_dir, output_dir, pattern, target_db, jobs, timeout, compare_sequential, ffmpeg_path='ffmpeg'):
+
+    input_files = list_audio_files(input_dir, pattern)
+    if not input_files:
+        logger.warning(f"No file matching '{pattern}' in {input_dir}")
+        return
+    logger.info(f"Normalizing {len(input_files)} files from '{input_dir}' to {target_db} dB")
+
+    start = time.perf_counter()
+    results = asyncio.run(normalize_directory(input_files, input_dir, output_dir, target_db,
+                                              max_jobs=jobs, timeout=timeout, ffmpeg_path=ffmpeg_path))
+    elapsed = time.perf_counter() - start
+
+    failed = [res for res in results if not res.ok]
+    for res in failed:
+        logger.error(f"{res.meta.get('input_file')}: {res.status}")
+    logger.success(f"{len(results) - len(failed)}/{len(results)} files normalized in {elapsed:.2f}s "
+                   f"({len(results) / elapsed:.2f} files/s)")
+
+    if compare_sequential:
+        ok_files = [f for f, res in zip(input_files, results) if res.ok]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            start = time.perf_counter()
+            normalize_directory_sequential(ok_files, input_dir, tmp_dir, target_db, ffmpeg_path=ffmpeg_path)
+            sequential_elapsed = time.perf_counter() - start
+        logger.info(f"Sequential path: {sequential_elapsed:.2f}s ({len(ok_files) / sequential_elapsed:.2f} files/s), "
+                    f"speedup x{sequential_elapsed / elapsed:.2f}")
+
+    if failed:
+        raise RuntimeError(f"{len(failed)} files could not be normalized")
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    logger.debug(f"Received arguments: {args}")
+
+    main(input_dir=args.input_dir,
+         output_dir=args.output_dir,
+         pattern=args.pattern,
+         target_db=args.target_db,
+         jobs=args.jobs,
+         timeout=args.timeout,
+         compare_sequential=args.compare_sequential,
+         ffmpeg_path=args.ffmpeg_path,
+        )
@@ -0,0 +1,183 @@
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from loguru import logger
+import argparse
+
+
+# Environment variables read by the BLAS / OpenMP runtimes when they start
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS", "VECLIB_MAXIMUM_THREADS")
+
+# How each kind of entry point uses the machine:
+#   min_threads: threads a worker needs to be efficient (bounds the number of workers by CPU)
+#   memory_per_worker: memory a worker needs (bounds the number of workers by memory)
+#   max_workers: None when workers should scale with the machine, else a fixed number of processes
+PROFILES = {
+    # One process running the sampler: every CPU goes to torch intra-op threads
+    'inference': dict(min_threads=1, memory_per_worker=3 * 1024 ** 3, max_workers=1),
+    # Processes sharing one copy of the weights, a sampler call does not scale past a few threads
+    'chunk_workers': dict(min_threads=4, memory_per_worker=1 * 1024 ** 3, max_workers=None),
+    # Processes each loading their own model and vocoder
+    'sweep': dict(min_threads=4, memory_per_worker=3 * 1024 ** 3, max_workers=None),
+    # Single-threaded ffmpeg processes
+    'ffmpeg': dict(min_threads=1, memory_per_worker=256 * 1024 ** 2, max_workers=None),
+}
+
+
+def _read(path):
+    try:
+        return Path(path).read_text().strip()
+    except OSError:
+        return None
+
+
+def cpu_affinity_count():
+    """Number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def cgroup_cpu_quota():
+    """CPU quota of the cgroup (in CPUs, e.g. 2.5), None if unlimited or unknown. Supports cgroup v2 and v1."""
+    cpu_max = _read("/sys/fs/cgroup/cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    quota, period = _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us"), _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def available_memory():
+    """Memory available to this process in bytes: MemAvailable, bounded by the cgroup limit minus its usage."""
+    available = None
+    meminfo = _read("/proc/meminfo")
+    if meminfo:
+        for line in meminfo.splitlines():
+            if line.startswith("MemAvailable:"):
+                available = int(line.split()[1]) * 1024
+                break
+
+    for limit_path, usage_path in (("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+                                   ("/sys/fs/cgroup/memory/memory.limit_in_bytes", "/sys/fs/cgroup/memory/memory.usage_in_bytes")):
+        limit, usage = _read(limit_path), _read(usage_path)
+        # cgroup v1 reports "no limit" as a huge number
+        if limit and limit != "max" and int(limit) < 1 << 60:
+            cgroup_available = int(limit) - int(usage or 0)
+            available = cgroup_available if available is None else min(available, cgroup_available)
+            break
+    return available
+
+
+@dataclass
+class ResourcePlan:
+    """CPU / memory allocation chosen for an entry point, see `plan_resources`."""
+    entry_point: str
+    cpus: float
+    affinity: int
+    quota: float
+    memory: int
+    workers: int
+    threads_per_worker: int
+    memory_per_worker: int
+
+    def apply(self):
+        """
+        Set the BLAS / OpenMP thread environment (inherited by worker processes) and the torch
+        intra-op threads of this process if torch is already imported.
+        """
+        for var in THREAD_ENV_VARS:
+            os.environ[var] = str(self.threads_per_worker)
+        if "torch" in sys.modules:
+            sys.modules["torch"].set_num_threads(self.threads_per_worker)
+        return self
+
+    def log(self):
+        memory = f"{self.memory / 1024 ** 3:.1f} GiB" if self.memory is not None else "unknown memory"
+        quota = f"{self.quota:g}" if self.quota is not None else "none"
+        logger.info(f"Resource plan for '{self.entry_point}': {self.cpus:g} CPUs (affinity {self.affinity}, cgroup quota {quota}), "
+                    f"{memory} available -> {self.workers} workers x {self.threads_per_worker} threads, "
+                    f"{self.memory_per_worker / 1024 ** 3:.2f} GiB per worker")
+        return self
+
+
+def plan_resources(entry_point: str, workers: int = None, threads_per_worker: int = None, memory_per_worker: int = None):
+    """
+    Choose the number of workers, threads per worker and memory per worker for `entry_point`
+    (one of PROFILES) from the CPUs this process may use (affinity and cgroup quota) and the
+    available memory. Any argument that is set overrides the automatic choice.
+
+    Returns:
+        ResourcePlan: The plan, call `.apply()` before importing torch / numpy heavy code and `.log()` to report it.
+    """
+    if entry_point not in PROFILES:
+        raise ValueError(f"Unknown entry point '{entry_point}', expected one of {list(PROFILES)}")
+    profile = PROFILES[entry_point]
+
+    affinity = cpu_affinity_count()
+    quota = cgroup_cpu_quota()
+    cpus = min(affinity, quota) if quota is not None else affinity
+    memory = available_memory()
+    memory_per_worker = memory_per_worker or profile['memory_per_worker']
+
+    if workers:
+        if profile['max_workers'] is not None:
+            workers = min(workers, profile['max_workers'])
+        if memory is not None and workers * memory_per_worker > memory:
+            logger.warning(f"{workers} '{entry_point}' workers need about {workers * memory_per_worker / 1024 ** 3:.1f} GiB, "
+                           f"only {memory / 1024 ** 3:.1f} GiB are available")
+    else:
+        workers = max(1, int(cpus // profile['min_threads']))
+        if profile['max_workers'] is not None:
+            workers = min(workers, profile['max_workers'])
+        if memory is not None:
+            workers = min(workers, max(1, memory // memory_per_worker))
+    if not threads_per_worker:
+        threads_per_worker = max(1, int(cpus // workers))
+
+    return ResourcePlan(entry_point=entry_point, cpus=cpus, affinity=affinity, quota=quota, memory=memory,
+                        workers=int(workers), threads_per_worker=int(threads_per_worker),
+                        memory_per_worker=int(memory_per_worker))
+
+
+def plan_from_config(entry_point: str, resources=None, workers: int = None):
+    """
+    `plan_resources` with the overrides of a config `resources` section (keys `workers`,
+    `threads_per_worker`, `memory_per_worker_mb`, empty values meaning automatic). An explicit
+    `workers` argument (e.g. from the command line) wins over the config.
+    """
+    resources = resources or {}
+    memory_mb = resources.get("memory_per_worker_mb")
+    return plan_resources(entry_point,
+                          workers=workers or resources.get("workers"),
+                          threads_per_worker=resources.get("threads_per_worker"),
+                          memory_per_worker=memory_mb * 1024 ** 2 if memory_mb else None)
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="Show the CPU / memory plan chosen for each kind of entry point on this machine",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--entry-points',
+        nargs='+',
+        default=list(PROFILES),
+        help="Entry point profiles to plan."
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    for entry_point in args.entry_points:
+        plan_resources(entry_point).log()
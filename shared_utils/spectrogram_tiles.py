@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import threading
+import wave
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from loguru import logger
+
+from .voice_activity import iter_wav_blocks
+
+
+class SpectrogramTiles:
+    """
+    Multi-resolution spectrogram of a WAV file, stored as float16 memory-mapped arrays.
+
+    Level `f` holds the STFT magnitude (dB) max-pooled over `f` consecutive frames, so that a
+    view of any width can be served from a level with about as many columns as pixels.
+    Every level is split in tiles of `tile_frames` frames; `get_window` only reads the tiles
+    overlapping the requested time range, and the `max_tiles` most recently used tiles stay in memory.
+
+    The STFT is computed once, block by block, and kept in `cache_dir` keyed by the file
+    content (path, size, mtime) and the analysis parameters. Each use touches the cache entry,
+    so that idle entries can be swept (see `SessionWorkspaces(cache_dirs=...)`).
+
+    Parameters:
+        input_file (str or Path): Path to the .wav file.
+        cache_dir (str or Path): Directory holding the memory-mapped levels.
+        n_fft (int): FFT size (also the window length).
+        hop (int): Hop length in samples.
+        levels (tuple[int]): Time pooling factors, the first one must be 1.
+        tile_frames (int): Number of frames per tile.
+        max_tiles (int): Number of tiles kept in memory.
+    """
+
+    def __init__(self, input_file, cache_dir, n_fft=512, hop=256, levels=(1, 8, 64), tile_frames=1024, max_tiles=256):
+        self.input_file = Path(input_file)
+        self.n_fft = n_fft
+        self.hop = hop
+        self.levels = tuple(levels)
+        self.tile_frames = tile_frames
+        self.max_tiles = max_tiles
+        self.n_bins = n_fft // 2 + 1
+        self._lock = threading.Lock()
+
+        with wave.open(str(self.input_file), 'rb') as wf:
+            self.framerate = wf.getframerate()
+            n_samples = wf.getnframes()
+        self.n_frames = 0 if n_samples < n_fft else 1 + (n_samples - n_fft) // hop
+
+        stat = self.input_file.stat()
+        key = json.dumps([str(self.input_file.resolve()), stat.st_size, stat.st_mtime_ns, n_fft, hop, list(self.levels)])
+        self.cache_dir = Path(cache_dir) / hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        self._maps = {}
+        self._tiles = OrderedDict()
+
+    @property
+    def frame_duration(self):
+        return self.hop / self.framerate
+
+    def _level_path(self, level):
+        return self.cache_dir / f"level_{level}.npy"
+
+    def _level_frames(self, level):
+        return -(-self.n_frames // level)
+
+    def build(self, block_seconds=30.0):
+        """Compute every level if not cached yet. Safe to call several times."""
+        with self._lock:
+            if (self.cache_dir / "meta.json").is_file():
+                # Mark the entry as used for the cache sweeper
+                os.utime(self.cache_dir)
+                return
+            # First build, or the entry was swept: drop what was read from a previous one
+            self._maps.clear()
+            self._tiles.clear()
+            os.makedirs(self.cache_dir, exist_ok=True)
+            logger.info(f"Computing spectrogram tiles of {self.input_file} ({self.n_frames} frames)")
+
+            base = np.lib.format.open_memmap(self._level_path(1), mode='w+', dtype=np.float16,
+                                             shape=(max(self.n_frames, 1), self.n_bins))
+            window = np.hanning(self.n_fft).astype(np.float32)
+            carry = np.zeros(0, dtype=np.float32)
+            written = 0
+            for _, samples in iter_wav_blocks(self.input_file, block_seconds=block_seconds):
+                buf = np.concatenate([carry, samples]) if carry.size else samples
+                n = 0 if buf.size < self.n_fft else 1 + (buf.size - self.n_fft) // self.hop
+                n = min(n, self.n_frames - written)
+                if n > 0:
+                    frames = sliding_window_view(buf, self.n_fft)[::self.hop][:n]
+                    magnitude = np.abs(np.fft.rfft(frames * window, axis=1))
+                    base[written:written + n] = 20.0 * np.log10(magnitude + 1e-6)
+                    written += n
+                carry = buf[n * self.hop:]
+            base.flush()
+
+            # Coarser levels, max-pooled from the base level one tile-aligned chunk at a time
+            for level in self.levels[1:]:
+                n_out = self._level_frames(level)
+                out = np.lib.format.open_memmap(self._level_path(level), mode='w+', dtype=np.float16,
+                                                shape=(max(n_out, 1), self.n_bins))
+                chunk = self.tile_frames * level
+                for start in range(0, self.n_frames, chunk):
+                    block = np.asarray(base[start:start + chunk], dtype=np.float32)
+                    pad = -block.shape[0] % level
+                    if pad:
+                        block = np.concatenate([block, np.repeat(block[-1:], pad, axis=0)])
+                    pooled = block.reshape(-1, level, self.n_bins).max(axis=1)
+                    out[start // level:start // level + pooled.shape[0]] = pooled
+                out.flush()
+                del out
+            del base
+
+            with open(self.cache_dir / "meta.json", "w", encoding="utf-8") as f:
+                json.dump({'n_frames': self.n_frames, 'framerate': self.framerate, 'n_fft': self.n_fft,
+                           'hop': self.hop, 'levels': list(self.levels)}, f)
+
+    def _level_map(self, level):
+        if level not in self._maps:
+            self._maps[level] = np.load(self._level_path(level), mmap_mode='r')
+        return self._maps[level]
+
+    def get_tile(self, level, index):
+        """Return tile `index` of `level` as an in-memory (frames, bins) float16 array."""
+        with self._lock:
+            key = (level, index)
+            if key in self._tiles:
+                self._tiles.move_to_end(key)
+                return self._tiles[key]
+            data = self._level_map(level)
+            tile = np.array(data[index * self.tile_frames:(index + 1) * self.tile_frames])
+            self._tiles[key] = tile
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+            return tile
+
+    def get_window(self, start_time=None, end_time=None, max_columns=1500):
+        """
+        Spectrogram of [start_time, end_time] with at most about `max_columns` time columns.
+
+        Returns:
+            tuple: (times (n,), freqs (bins,), magnitudes in dB (bins, n) float32)
+        """
+        self.build()
+        duration = self.n_frames * self.frame_duration
+        start_time = max(0.0, start_time or 0.0)
+        end_time = min(duration, end_time if end_time is not None else duration)
+        freqs = np.fft.rfftfreq(self.n_fft, 1.0 / self.framerate)
+        if end_time <= start_time or self.n_frames == 0:
+            return np.zeros(0), freqs, np.zeros((self.n_bins, 0), dtype=np.float32)
+
+        n_visible = (end_time - start_time) / self.frame_duration
+        level = next((lvl for lvl in self.levels if n_visible / lvl <= max_columns), self.levels[-1])
+
+        first = int(start_time / self.frame_duration) // level
+        last = min(self._level_frames(level), int(np.ceil(end_time / self.frame_duration / level)) + 1)
+        tiles = [self.get_tile(level, i) for i in range(first // self.tile_frames, (last - 1) // self.tile_frames + 1)]
+        offset = (first // self.tile_frames) * self.tile_frames
+        columns = np.concatenate(tiles)[first - offset:last - offset]
+
+        step = max(1, int(np.ceil(columns.shape[0] / max_columns)))
+        columns = columns[::step]
+        times = (first + np.arange(columns.shape[0]) * step) * level * self.frame_duration + self.n_fft / 2 / self.framerate
+        return times, freqs, columns.T.astype(np.float32)
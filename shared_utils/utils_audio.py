@@ -25,6 +25,26 @@ def run_ffmpeg_command(ffmpeg_cmd):
     return result
 
 
+def build_volumedetect_command(input_file, ffmpeg_path='ffmpeg'):
+    """Build the ffmpeg command measuring the volume of a file with the volumedetect filter."""
+    return [
+        ffmpeg_path,
+        '-i', str(input_file),
+        '-af', 'volumedetect',
+        '-f', 'null',
+        '-'
+    ]
+
+
+def parse_mean_volume(ffmpeg_stderr):
+    """Extract the mean volume in dB from the volumedetect output, None if absent."""
+    mean_volume_pattern = re.compile(r"mean_volume:\s+(-?\d+(?:\.\d+)?) dB", re.MULTILINE)
+    match = mean_volume_pattern.search(ffmpeg_stderr)
+    if match:
+        return float(match.group(1))
+    return None
+
+
 def get_audio_mean_volume(input_file, ffmpeg_path='ffmpeg'):
     """
     Analyze the mean volume (in dB) of an audio file using the volumedetect filter.
@@ -38,22 +58,10 @@ def get_audio_mean_volume(input_file, ffmpeg_path='ffmpeg'):
     """
     input_file = Path(input_file)
 
-    ffmpeg_cmd = [
-        ffmpeg_path,
-        '-i', str(input_file),
-        '-af', 'volumedetect',
-        '-f', 'null',
-        '-'
-    ]
-
-    result = run_ffmpeg_command(ffmpeg_cmd)
-
-    mean_volume_pattern = re.compile(r"mean_volume:\s+(-?\d+(?:\.\d+)?) dB", re.MULTILINE)
+    result = run_ffmpeg_command(build_volumedetect_command(input_file, ffmpeg_path=ffmpeg_path))
 
-    match = mean_volume_pattern.search(result.stderr)
-    mean_volume = None
-    if match:
-        mean_volume = float(match.group(1))
+    mean_volume = parse_mean_volume(result.stderr)
+    if mean_volume is not None:
         logger.info(f"Detected mean volume: {mean_volume} dB in file {input_file}")
     else:
         logger.warning("Could not find mean_volume in the ffmpeg output.")
@@ -61,6 +69,30 @@ def get_audio_mean_volume(input_file, ffmpeg_path='ffmpeg'):
     return mean_volume
 
 
+def build_gain_command(input_file, output_file, diff_db, ffmpeg_path='ffmpeg'):
+    """Build the ffmpeg command applying a `diff_db` gain (a plain copy when the gain is negligible)."""
+    # If diff_db is close to 0, no real adjustment is needed
+    if abs(diff_db) < 0.05:
+        # Just copy without changing volume
+        return [
+            ffmpeg_path,
+            '-y',
+            '-i', str(input_file),
+            '-c:a', 'copy',
+            str(output_file)
+        ]
+
+    # Use the volume filter to apply the difference
+    volume_filter = f"volume={diff_db}dB"
+    return [
+        ffmpeg_path,
+        '-y',
+        '-i', str(input_file),
+        '-af', volume_filter,
+        str(output_file)
+    ]
+
+
 def normalize_audio(input_file, output_file, target_db, ffmpeg_path='ffmpeg'):
     """
     Normalize the audio to a target mean dB by applying a volume filter.
@@ -70,37 +102,53 @@ def normalize_audio(input_file, output_file, target_db, ffmpeg_path='ffmpeg'):
         output_file (str or Path): Path to the normalized output file.
         target_db (float): The desired mean volume in dB (e.g., -20.0).
         ffmpeg_path (str): Path to the ffmpeg executable. Defaults to 'ffmpeg' if in PATH.
+
+    Returns:
+        bool: True if `output_file` was written, False if the normalization was skipped (no mean volume detected).
     """
     mean_volume = get_audio_mean_volume(input_file, ffmpeg_path=ffmpeg_path)
     if mean_volume is None:
         logger.warning("No mean volume detected; skipping normalization.")
-        return
+        return False
 
     # Compute the difference from target_db
     diff_db = target_db - mean_volume
     logger.info(f"Current mean dB: {mean_volume}, target: {target_db}, diff: {diff_db}")
 
-    # If diff_db is close to 0, no real adjustment is needed
     if abs(diff_db) < 0.05:
         logger.info(f"No significant volume change needed for {input_file}")
-        # Just copy without changing volume
-        ffmpeg_cmd = [
-            ffmpeg_path,
-            '-y',
-            '-i', str(input_file),
-            '-c:a', 'copy',
-            str(output_file)
-        ]
-    else:
-        # Use the volume filter to apply the difference
-        volume_filter = f"volume={diff_db}dB"
-        ffmpeg_cmd = [
-            ffmpeg_path,
-            '-y',
-            '-i', str(input_file),
-            '-af', volume_filter,
-            str(output_file)
-        ]
+    ffmpeg_cmd = build_gain_command(input_file, output_file, diff_db, ffmpeg_path=ffmpeg_path)
+
+    run_ffmpeg_command(ffmpeg_cmd)
+    logger.success(f"Normalized audio saved to {output_file}")
+    return True
+
+
+def decode_to_wav(input_file, output_file, start_time=None, duration=None, sample_rate=None, channels=None, ffmpeg_path='ffmpeg'):
+    """
+    Decode any ffmpeg-readable audio (m4a, webm, mp3, wav...) to a 16-bit PCM WAV file,
+    optionally cutting a segment out of it in the same pass.
+
+    Parameters:
+        input_file (str or Path): Path to the source audio file.
+        output_file (str or Path): Path to the output .wav file.
+        start_time (float): Start time in seconds of the segment to keep. Whole file if None.
+        duration (float): Length in seconds of the segment to keep. Until the end if None.
+        sample_rate (int): Output sample rate. Keeps the source rate if None.
+        channels (int): Output channel count. Keeps the source layout if None.
+        ffmpeg_path (str): Path to the ffmpeg executable. Defaults to 'ffmpeg' if in PATH.
+    """
+    ffmpeg_cmd = [ffmpeg_path, '-y']
+    if start_time is not None:
+        ffmpeg_cmd += ['-ss', str(start_time)]
+    if duration is not None:
+        ffmpeg_cmd += ['-t', str(duration)]
+    ffmpeg_cmd += ['-i', str(input_file), '-vn']
+    if sample_rate is not None:
+        ffmpeg_cmd += ['-ar', str(sample_rate)]
+    if channels is not None:
+        ffmpeg_cmd += ['-ac', str(channels)]
+    ffmpeg_cmd += ['-c:a', 'pcm_s16le', str(output_file)]
 
     run_ffmpeg_command(ffmpeg_cmd)
-    logger.success(f"Normalized audio saved to {output_file}")
\ No newline at end of file
+    logger.debug(f"Decoded {input_file} to PCM WAV {output_file}")
@@ -0,0 +1,322 @@
+import argparse
+import json
+import os
+import tempfile
+import wave
+from pathlib import Path
+import numpy as np
+from loguru import logger
+
+from .utils_audio import decode_to_wav
+
+
+def pcm_to_float(raw_data, samp_width, n_channels):
+    """Convert raw little-endian PCM bytes to a mono float32 array in [-1, 1]."""
+    if samp_width == 1:
+        samples = (np.frombuffer(raw_data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif samp_width == 2:
+        samples = np.frombuffer(raw_data, dtype='<i2').astype(np.float32) / 32768.0
+    elif samp_width == 3:
+        triplets = np.frombuffer(raw_data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = triplets[:, 0] | (triplets[:, 1] << 8) | (triplets[:, 2] << 16)
+        values = np.where(values >= 1 << 23, values - (1 << 24), values)
+        samples = values.astype(np.float32) / float(1 << 23)
+    elif samp_width == 4:
+        samples = np.frombuffer(raw_data, dtype='<i4').astype(np.float32) / float(1 << 31)
+    else:
+        raise ValueError("Unsupported sample width")
+
+    if n_channels > 1:
+        samples = samples.reshape(-1, n_channels).mean(axis=1)
+    return samples
+
+
+def iter_wav_blocks(file_path, block_seconds=30.0):
+    """
+    Read a WAV file block by block so that memory stays bounded whatever its length.
+
+    Yields:
+        tuple: (framerate, mono float32 samples of the block)
+    """
+    with wave.open(str(file_path), 'rb') as wf:
+        n_channels = wf.getnchannels()
+        samp_width = wf.getsampwidth()
+        framerate = wf.getframerate()
+        block_frames = max(1, int(block_seconds * framerate))
+        while True:
+            raw_data = wf.readframes(block_frames)
+            if not raw_data:
+                break
+            yield framerate, pcm_to_float(raw_data, samp_width, n_channels)
+
+
+def analyze_frames(file_path, frame_duration=0.02, clip_level=0.999, block_seconds=30.0):
+    """
+    Compute per-frame energy and clipping statistics of a WAV file in a single streaming pass.
+
+    Each block is processed as a (n_frames, frame_len) matrix, the samples left over at the
+    end of a block are carried over to the next one.
+
+    Parameters:
+        file_path (str or Path): Path to the .wav file.
+        frame_duration (float): Frame length in seconds.
+        clip_level (float): Absolute amplitude above which a sample counts as clipped.
+        block_seconds (float): Amount of audio decoded at once.
+
+    Returns:
+        dict: 'frame_duration', 'energy_db' (float32 array) and 'clipped' (int32 array, clipped samples per frame).
+    """
+    energy_db, clipped = [], []
+    carry = np.zeros(0, dtype=np.float32)
+    frame_len = None
+
+    for framerate, samples in iter_wav_blocks(file_path, block_seconds=block_seconds):
+        if frame_len is None:
+            frame_len = max(1, int(round(frame_duration * framerate)))
+            frame_duration = frame_len / framerate
+        samples = np.concatenate([carry, samples]) if carry.size else samples
+        n_frames = samples.size // frame_len
+        frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len)
+        carry = samples[n_frames * frame_len:]
+
+        rms = np.sqrt(np.mean(np.square(frames), axis=1))
+        energy_db.append((20.0 * np.log10(rms + 1e-10)).astype(np.float32))
+        clipped.append(np.count_nonzero(np.abs(frames) >= clip_level, axis=1).astype(np.int32))
+
+    if not energy_db:
+        return {'frame_duration': frame_duration, 'energy_db': np.zeros(0, np.float32), 'clipped': np.zeros(0, np.int32)}
+
+    return {
+        'frame_duration': frame_duration,
+        'energy_db': np.concatenate(energy_db),
+        'clipped': np.concatenate(clipped),
+    }
+
+
+def _runs(mask):
+    """Return (starts, ends) frame indices of the True runs of a boolean array, ends excluded."""
+    padded = np.concatenate([[False], mask, [False]]).astype(np.int8)
+    edges = np.diff(padded)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_speech(energy_db, frame_duration, margin_db=12.0, hangover=0.15, min_speech=0.1):
+    """
+    Energy based voice-activity detection relative to the estimated noise floor.
+
+    Parameters:
+        energy_db (np.ndarray): Per-frame energy in dB.
+        frame_duration (float): Frame length in seconds.
+        margin_db (float): How far above the noise floor a frame must be to count as speech.
+        hangover (float): Speech is extended by this many seconds on both sides, bridging short dips.
+        min_speech (float): Speech bursts shorter than this are discarded.
+
+    Returns:
+        tuple: (speech mask, noise floor in dB)
+    """
+    if energy_db.size == 0:
+        return np.zeros(0, dtype=bool), -100.0
+
+    noise_floor_db = float(np.percentile(energy_db, 10))
+    speech = energy_db > noise_floor_db + margin_db
+
+    hang = int(round(hangover / frame_duration))
+    if hang > 0:
+        kernel = np.ones(2 * hang + 1, dtype=np.int32)
+        speech = np.convolve(speech.astype(np.int32), kernel, mode='same') > 0
+
+    starts, ends = _runs(speech)
+    too_short = (ends - starts) < int(round(min_speech / frame_duration)) + 2 * hang
+    for start, end in zip(starts[too_short], ends[too_short]):
+        speech[start:end] = False
+
+    return speech, noise_floor_db
+
+
+def propose_segments(features, target_duration=6.0, max_duration=10.0, min_pause=0.25, margin_db=12.0,
+                     max_clipped=0, top_k=5, padding=0.1):
+    """
+    Propose the shortest clean reference segments of at least `target_duration` seconds.
+
+    Segments start and end in pauses, so they never cut a word. Candidates are ranked by
+    SNR and speech density, clipped candidates are dropped, and the returned segments never overlap.
+
+    Parameters:
+        features (dict): Output of `analyze_frames`.
+        target_duration (float): Minimum length of a proposed segment, in seconds.
+        max_duration (float): Maximum length of a proposed segment, in seconds.
+        min_pause (float): Minimum silence between two utterances to cut between them.
+        margin_db (float): Speech detection margin above the noise floor.
+        max_clipped (int): Maximum number of clipped samples tolerated in a segment.
+        top_k (int): Number of segments returned.
+        padding (float): Silence kept before and after the speech, taken from the surrounding pauses.
+
+    Returns:
+        list[dict]: Segments with 'start', 'end', 'duration', 'snr_db', 'speech_ratio', 'clipped' and 'score'.
+    """
+    frame_duration = features['frame_duration']
+    energy_db = features['energy_db']
+    clipped = features['clipped']
+
+    speech, noise_floor_db = detect_speech(energy_db, frame_duration, margin_db=margin_db)
+    starts, ends = _runs(speech)
+    if starts.size == 0:
+        return []
+
+    # Merge utterances separated by pauses too short to cut in
+    gaps = starts[1:] - ends[:-1]
+    keep = np.concatenate([[True], gaps >= int(round(min_pause / frame_duration))])
+    group = np.cumsum(keep) - 1
+    utt_starts = starts[keep]
+    utt_ends = np.zeros_like(utt_starts)
+    np.maximum.at(utt_ends, group, ends)
+
+    power = np.power(10.0, energy_db / 10.0)
+    cum_power = np.concatenate([[0.0], np.cumsum(power * speech)])
+    cum_speech = np.concatenate([[0], np.cumsum(speech)])
+    cum_clipped = np.concatenate([[0], np.cumsum(clipped)])
+
+    target_frames = target_duration / frame_duration
+    max_frames = max_duration / frame_duration
+    pad_frames = int(round(padding / frame_duration))
+
+    candidates = []
+    j = 0
+    for i in range(utt_starts.size):
+        j = max(j, i)
+        while j < utt_starts.size and utt_ends[j] - utt_starts[i] < target_frames:
+            j += 1
+        if j == utt_starts.size:
+            break
+        start, end = utt_starts[i], utt_ends[j]
+        if end - start > max_frames:
+            continue
+
+        n_clipped = int(cum_clipped[end] - cum_clipped[start])
+        if n_clipped > max_clipped:
+            continue
+
+        n_speech = int(cum_speech[end] - cum_speech[start])
+        speech_ratio = n_speech / (end - start)
+        snr_db = 10.0 * np.log10((cum_power[end] - cum_power[start]) / max(n_speech, 1) + 1e-20) - noise_floor_db
+        # Prefer clean, dense and short segments
+        score = snr_db + 10.0 * speech_ratio - 2.0 * (end - start - target_frames) * frame_duration
+        candidates.append((score, start, end, snr_db, speech_ratio, n_clipped))
+
+    candidates.sort(key=lambda c: c[0], reverse=True)
+    selected = []
+    n_frames = energy_db.size
+    for score, start, end, snr_db, speech_ratio, n_clipped in candidates:
+        if any(start < s_end and s_start < end for _, s_start, s_end, *_ in selected):
+            continue
+        selected.append((score, start, end, snr_db, speech_ratio, n_clipped))
+        if len(selected) >= top_k:
+            break
+
+    segments = []
+    for score, start, end, snr_db, speech_ratio, n_clipped in selected:
+        start_s = max(0, start - pad_frames) * frame_duration
+        end_s = min(n_frames, end + pad_frames) * frame_duration
+        segments.append({
+            'start': round(start_s, 2),
+            'end': round(end_s, 2),
+            'duration': round(end_s - start_s, 2),
+            'snr_db': round(float(snr_db), 1),
+            'speech_ratio': round(float(speech_ratio), 3),
+            'clipped': n_clipped,
+            'score': round(float(score), 2),
+        })
+    return segments
+
+
+def suggest_reference_clips(input_file, ffmpeg_path='ffmpeg', **kwargs):
+    """
+    Analyze an audio file and propose reference segments (see `propose_segments` for kwargs).
+    Non-WAV inputs are first decoded to a temporary 16 kHz mono WAV file.
+    """
+    input_file = Path(input_file)
+    if not input_file.is_file():
+        raise FileNotFoundError(f"Input file not found: {input_file}")
+
+    if input_file.suffix.lower() == ".wav":
+        features = analyze_frames(input_file)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            decoded = os.path.join(tmp_dir, "decoded.wav")
+            decode_to_wav(input_file, decoded, sample_rate=16000, channels=1, ffmpeg_path=ffmpeg_path)
+            features = analyze_frames(decoded)
+
+    logger.info(f"Analyzed {features['energy_db'].size * features['frame_duration']:.1f}s of audio from {input_file}")
+    return propose_segments(features, **kwargs)
+
+
+def parse_arguments() -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(
+        description="Scan a recording and propose clean reference segments for voice cloning.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    parser.add_argument(
+        '--input-file',
+        type=Path,
+        required=True,
+        help="Path to the input audio file (e.g., .wav, .m4a)."
+    )
+
+    parser.add_argument(
+        '--target-duration',
+        type=float,
+        default=6.0,
+        help="Minimum duration in seconds of a proposed segment."
+    )
+
+    parser.add_argument(
+        '--max-duration',
+        type=float,
+        default=10.0,
+        help="Maximum duration in seconds of a proposed segment."
+    )
+
+    parser.add_argument(
+        '--top-k',
+        type=int,
+        default=5,
+        help="Number of segments to propose."
+    )
+
+    parser.add_argument(
+        '--output-json',
+        type=Path,
+        default=None,
+        help="Optional path where the proposed segments are written as JSON."
+    )
+
+    parser.add_argument(
+        '--ffmpeg-path',
+        type=str,
+        default='ffmpeg',
+        help="Path to the ffmpeg executable. Defaults to 'ffmpeg' if in PATH."
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+
+    args = parse_arguments()
+    logger.debug(f"Received arguments: {args}")
+
+    segments = suggest_reference_clips(args.input_file,
+                                       ffmpeg_path=args.ffmpeg_path,
+                                       target_duration=args.target_duration,
+                                       max_duration=args.max_duration,
+                                       top_k=args.top_k,
+                                       )
+    for seg in segments:
+        logger.info(f"{seg['start']:>9.2f}s -> {seg['end']:>9.2f}s ({seg['duration']:.2f}s)  "
+                    f"SNR {seg['snr_db']} dB, speech {seg['speech_ratio']:.0%}")
+    if args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(segments, f, indent=2)
+        logger.success(f"Proposed segments saved to {args.output_json}")
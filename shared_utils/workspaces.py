@@ -0,0 +1,147 @@
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from loguru import logger
+
+
+_SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def new_session_id():
+    """Return a fresh random session identifier."""
+    return uuid.uuid4().hex
+
+
+@contextmanager
+def atomic_output(final_path):
+    """
+    Yield a temporary path next to `final_path` and move it over `final_path` only once the
+    block succeeds, so readers never see a partially written file.
+
+    The temporary file keeps the suffix of `final_path` so that ffmpeg picks the same format.
+    """
+    final_path = Path(final_path)
+    os.makedirs(final_path.parent, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{final_path.stem}_", suffix=final_path.suffix, dir=final_path.parent)
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, final_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class SessionWorkspaces:
+    """
+    Per-session scratch directories below `root`, each browser session getting its own.
+
+    Workspaces are cleaned up by `sweep`: those not used for `max_age` seconds are removed,
+    then the least recently used ones until the total size fits in `max_bytes`. The entries
+    (subdirectories) of shared caches listed in `cache_dirs` are swept the same way, their users
+    being expected to touch an entry whenever they use it.
+
+    Parameters:
+        root (str or Path): Directory holding the session workspaces.
+        max_age (float): Seconds after which an idle workspace is removed.
+        max_bytes (int): Maximum total size of all workspaces and cache entries.
+        cache_dirs (list): Cache directories whose entries are swept along with the workspaces.
+    """
+
+    def __init__(self, root, max_age=6 * 3600, max_bytes=2 * 1024 ** 3, cache_dirs=()):
+        self.root = Path(root)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.cache_dirs = [Path(d) for d in cache_dirs]
+        self._lock = threading.Lock()
+        self._sweeper = None
+        os.makedirs(self.root, exist_ok=True)
+
+    def get(self, session_id):
+        """Return the workspace of `session_id`, creating it if needed and marking it as used."""
+        if not session_id or not _SESSION_ID_PATTERN.match(session_id):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        path = self.root / session_id
+        with self._lock:
+            os.makedirs(path, exist_ok=True)
+            os.utime(path)
+        return path
+
+    @contextmanager
+    def job_dir(self, session_id):
+        """Yield a private directory inside the session workspace for one job, removed afterwards."""
+        job_path = tempfile.mkdtemp(prefix="job_", dir=self.get(session_id))
+        try:
+            yield job_path
+        finally:
+            shutil.rmtree(job_path, ignore_errors=True)
+
+    def _entries(self):
+        for path in self.root.iterdir():
+            if path.is_dir() and _SESSION_ID_PATTERN.match(path.name):
+                yield path
+        for cache_dir in self.cache_dirs:
+            if cache_dir.is_dir():
+                yield from (path for path in cache_dir.iterdir() if path.is_dir())
+
+    def sweep(self):
+        """
+        Remove idle workspaces and cache entries, then the oldest ones until the size budget is met.
+        Returns the removed count.
+        """
+        now = time.time()
+        removed = 0
+        with self._lock:
+            workspaces = []
+            for path in self._entries():
+                mtime = path.stat().st_mtime
+                if now - mtime > self.max_age:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+                else:
+                    workspaces.append((mtime, path, _dir_size(path)))
+
+            total = sum(size for _, _, size in workspaces)
+            for mtime, path, size in sorted(workspaces, key=lambda w: w[0]):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                removed += 1
+
+        if removed:
+            logger.info(f"Workspace sweeper removed {removed} session workspaces and cache entries")
+        return removed
+
+    def start_sweeper(self, interval=600):
+        """Run `sweep` every `interval` seconds in a daemon thread."""
+        if self._sweeper is not None:
+            return
+
+        def _loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sweep()
+                except OSError as e:
+                    logger.warning(f"Workspace sweep failed: {e}")
+
+        self._sweeper = threading.Thread(target=_loop, name="workspace-sweeper", daemon=True)
+        self._sweeper.start()